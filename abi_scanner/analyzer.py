@@ -13,6 +13,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from .module_scanner import pattern_rules
+
 
 def demangle_symbol(mangled: str) -> str:
     """Demangle C++ symbol using c++filt."""
@@ -30,6 +32,14 @@ def demangle_symbol(mangled: str) -> str:
     return mangled
 
 
+_PAREN_RE = re.compile(r'\([^)]*\)')
+
+# Scope names that end the "primary namespace" walk in extract_namespace()
+_NAMESPACE_STOP_PARTS = frozenset(
+    ('detail', 'internal', 'backend', 'impl', 'v1', 'v2', 'interface1', 'interface2')
+)
+
+
 def extract_namespace(demangled: str) -> str:
     """Extract primary namespace from demangled symbol.
     
@@ -39,18 +49,21 @@ def extract_namespace(demangled: str) -> str:
         'std::__detail::__variant::foo' -> 'std'
     """
     # Remove template args properly handling nesting
-    simplified_chars = []
-    depth = 0
-    for char in demangled:
-        if char == '<':
-            depth += 1
-        elif char == '>':
-            depth = max(0, depth - 1)
-        elif depth == 0:
-            simplified_chars.append(char)
-    simplified = ''.join(simplified_chars)
+    if '<' in demangled or '>' in demangled:
+        simplified_chars = []
+        depth = 0
+        for char in demangled:
+            if char == '<':
+                depth += 1
+            elif char == '>':
+                depth = max(0, depth - 1)
+            elif depth == 0:
+                simplified_chars.append(char)
+        simplified = ''.join(simplified_chars)
+    else:
+        simplified = demangled
     
-    simplified = re.sub(r'\([^)]*\)', '', simplified)
+    simplified = _PAREN_RE.sub('', simplified)
     
     # Extract namespace parts (before last ::)
     parts = simplified.split('::')
@@ -61,7 +74,7 @@ def extract_namespace(demangled: str) -> str:
     # Skip detail/internal/backend parts
     ns_parts = []
     for part in parts[:-1]:  # Exclude last part (class/function name)
-        if part in ('detail', 'internal', 'backend', 'impl', 'v1', 'v2', 'interface1', 'interface2'):
+        if part in _NAMESPACE_STOP_PARTS:
             break
         ns_parts.append(part)
         if len(ns_parts) >= 2:
@@ -71,6 +84,10 @@ def extract_namespace(demangled: str) -> str:
 
 
 
+_TIER_INTERNAL_SUBSTRINGS = ('::detail::', '::internal::', '::backend::', '::impl::')
+_TIER_PREVIEW_SUBSTRINGS = ('::preview::', '::experimental::', '::unstable::')
+
+
 def classify_symbol_tier(demangled: str) -> str:
     """Classify a demangled symbol into public/preview/internal tier.
 
@@ -80,9 +97,9 @@ def classify_symbol_tier(demangled: str) -> str:
       public   : everything else (stable public API)
     """
     lowered = demangled.lower()
-    if any(pat in lowered for pat in ('::detail::', '::internal::', '::backend::', '::impl::')):
+    if any(pat in lowered for pat in _TIER_INTERNAL_SUBSTRINGS):
         return 'internal'
-    if any(pat in lowered for pat in ('::preview::', '::experimental::', '::unstable::')):
+    if any(pat in lowered for pat in _TIER_PREVIEW_SUBSTRINGS):
         return 'preview'
     return 'public'
 
@@ -294,32 +311,33 @@ class PublicAPIFilter:
             r"tbb::detail::",
             r"_Z.*internal",
         ]
-        self._compiled_patterns = [re.compile(p) for p in self.private_patterns]
+        # Literal patterns are checked with str.startswith / `in`; only the
+        # genuine regexes (here "_Z.*internal") go through one compiled alternation
+        self._private_prefixes, self._private_substrings, self._private_re = \
+            pattern_rules(tuple(self.private_patterns))
         
         # Compile public namespace patterns with boundary matching
         # to avoid false positives like "foo" matching "foobar::..."
-        self._public_ns_patterns = [
-            re.compile(rf"(?:^|::){re.escape(ns)}(?:$|::)")
-            for ns in self.public_namespaces
-        ]
+        self._public_ns_re = (
+            re.compile(r"(?:^|::)(?:%s)(?:$|::)"
+                       % "|".join(re.escape(ns) for ns in self.public_namespaces))
+            if self.public_namespaces else None
+        )
     
     def is_public(self, symbol: str) -> bool:
         """Check if symbol belongs to public API"""
         # First check against private patterns (fast reject)
-        for pattern in self._compiled_patterns:
-            if pattern.search(symbol):
-                return False
+        if symbol.startswith(self._private_prefixes) \
+                or any(sub in symbol for sub in self._private_substrings) \
+                or (self._private_re is not None and self._private_re.search(symbol)):
+            return False
         
         # If no public namespaces defined, assume public
-        if not self._public_ns_patterns:
+        if self._public_ns_re is None:
             return True
         
         # Check if symbol matches any public namespace (boundary-aware)
-        for pattern in self._public_ns_patterns:
-            if pattern.search(symbol):
-                return True
-        
-        return False
+        return self._public_ns_re.search(symbol) is not None
     
     @classmethod
     def from_json(cls, api_file: Path) -> "PublicAPIFilter":
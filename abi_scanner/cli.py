@@ -1,11 +1,13 @@
 """CLI interface for abi-scanner."""
 
 import json
+import os
 import shutil
 import subprocess
 import sys
 import tempfile
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 from typing import Optional
@@ -1051,6 +1053,16 @@ def cmd_validate(args):
             abi_cache[key] = result_dict
             return result_dict
 
+        # Provision every version (download + abidw) up front on a thread pool:
+        # the work is all subprocesses, and the pair loop below then only hits
+        # abi_cache.  Each version gets its own pkg_<idx> directory.  abidw can
+        # take GBs of RAM on large libraries, so the default stays small.
+        _jobs = getattr(args, "jobs", None) or min(4, os.cpu_count() or 1)
+        _workers = min(max(1, _jobs), len(parsed))
+        if _workers > 1:
+            with ThreadPoolExecutor(max_workers=_workers) as pool:
+                list(pool.map(get_abi, [v for _pv, v in parsed], range(len(parsed))))
+
         for i in range(len(parsed) - 1):
             old_pv, old_v = parsed[i]
             new_pv, new_v = parsed[i + 1]
@@ -1578,6 +1590,10 @@ Exit codes:
                      help="Return non-zero exit code based on violation count (capped at 125)")
     val.add_argument("--details-limit", type=int, default=20,
                      help="Max symbols per namespace shown per violation (default: 20, 0 = unlimited)")
+    val.add_argument("--jobs", type=int, default=None,
+                     help="Versions to download and run abidw on concurrently "
+                          "(default: 4, or fewer CPUs; abidw may use GBs of RAM per job). "
+                          "With -v, output from concurrent jobs interleaves")
     val.add_argument("-v", "--verbose", action="store_true")
 
     # list
@@ -2,45 +2,181 @@
 
 from __future__ import annotations
 
+import atexit
+import ctypes
+import ctypes.util
+import functools
+import itertools
 import re
 import shutil
 import subprocess
-from typing import Dict, List, Iterable, Tuple
+import threading
+from typing import Callable, Dict, List, Iterable, Optional, Tuple, Union
+
+try:
+    import cxxfilt as _cxxfilt
+except ImportError:
+    _cxxfilt = None
+
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
 
 
 CategoryStats = Dict[str, Dict[str, int]]
 CategorySymbols = Dict[str, Dict[str, List[str]]]
 
+# Per-symbol memo size: comfortably holds every symbol of a long version
+# history of a large library while keeping memory bounded.
+SYMBOL_CACHE_SIZE = 200_000
+
+
+class _CxxFilt:
+    """A single long-lived ``c++filt`` process shared by all demangle calls.
+
+    c++filt answers one output line per input line, so queries are a pipe
+    round-trip instead of a fork/exec per call. Input is written in bounded
+    chunks so neither pipe buffer can fill up and deadlock the exchange.
+    """
+
+    _CHUNK_CHARS = 16384
+
+    def __init__(self) -> None:
+        self._proc: "subprocess.Popen[str] | None" = None
+        self._lock = threading.Lock()
+
+    def _ensure(self) -> "subprocess.Popen[str] | None":
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        cppfilt = shutil.which("c++filt")
+        if not cppfilt:
+            return None
+        self._proc = subprocess.Popen(
+            [cppfilt],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        return self._proc
+
+    def _exchange(self, proc: "subprocess.Popen[str]", chunk: "list[str]") -> "list[str]":
+        proc.stdin.write("\n".join(chunk) + "\n")
+        proc.stdin.flush()
+        out = [proc.stdout.readline() for _ in chunk]
+        if not out[-1]:
+            raise OSError("c++filt exited unexpectedly")
+        return [line.rstrip("\n") for line in out]
+
+    def demangle_many(self, symbols: "list[str]") -> "list[str]":
+        """Demangle symbols in order; returns them unchanged if c++filt is unusable."""
+        with self._lock:
+            try:
+                proc = self._ensure()
+                if proc is None:
+                    return list(symbols)
+                result: "list[str]" = []
+                chunk: "list[str]" = []
+                size = 0
+                for sym in symbols:
+                    chunk.append(sym)
+                    size += len(sym) + 1
+                    if size >= self._CHUNK_CHARS:
+                        result.extend(self._exchange(proc, chunk))
+                        chunk, size = [], 0
+                if chunk:
+                    result.extend(self._exchange(proc, chunk))
+                return result
+            except (OSError, ValueError):
+                self.close()
+                return list(symbols)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+            proc.stdin.close()
+            proc.stdout.close()
+
+
+_CXXFILT = _CxxFilt()
+atexit.register(_CXXFILT.close)
+
+
+def _load_cxa_demangle() -> Optional[Callable[[str], Optional[str]]]:
+    """Bind ``abi::__cxa_demangle`` from libstdc++ via ctypes, if available."""
+    try:
+        lib = ctypes.CDLL(ctypes.util.find_library("stdc++") or "libstdc++.so.6")
+        libc = ctypes.CDLL(None)
+        cxa_demangle = lib.__cxa_demangle
+        free = libc.free
+    except (OSError, AttributeError):
+        return None
+    cxa_demangle.restype = ctypes.c_void_p
+    cxa_demangle.argtypes = [ctypes.c_char_p, ctypes.c_void_p, ctypes.c_void_p,
+                             ctypes.POINTER(ctypes.c_int)]
+    free.argtypes = [ctypes.c_void_p]
+    free.restype = None
+
+    def demangle(symbol: str) -> Optional[str]:
+        status = ctypes.c_int(0)
+        buf = cxa_demangle(symbol.encode(), None, None, ctypes.byref(status))
+        if not buf:
+            return None
+        try:
+            return ctypes.string_at(buf).decode(errors="replace") if status.value == 0 else None
+        finally:
+            free(buf)
+
+    return demangle
+
+
+def _load_cxxfilt_module() -> Optional[Callable[[str], Optional[str]]]:
+    if _cxxfilt is None:
+        return None
+
+    def demangle(symbol: str) -> Optional[str]:
+        try:
+            return _cxxfilt.demangle(symbol)
+        except _cxxfilt.Error:
+            return None
+
+    return demangle
+
+
+# In-process demangler, preferred over the c++filt pipe when one is available.
+_IN_PROCESS_DEMANGLE = _load_cxxfilt_module() or _load_cxa_demangle()
+
+
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _demangle_in_process(symbol: str) -> str:
+    # __cxa_demangle rejects ELF version suffixes ("@@LIB_1.0"); c++filt keeps
+    # them verbatim after the demangled name, so do the same.
+    name, at, version = symbol.partition("@")
+    demangled = _IN_PROCESS_DEMANGLE(name) if name.startswith("_Z") else None
+    return demangled + at + version if demangled else symbol
+
 
 def demangle_symbols(symbols: "list[str]") -> "dict[str, str]":
-    """Batch demangle C++ symbols using a single c++filt invocation.
+    """Batch demangle C++ symbols.
 
+    Uses an in-process demangler (the ``cxxfilt`` package or libstdc++'s
+    ``__cxa_demangle``) when available and the shared c++filt process otherwise.
     Returns a dict mapping mangled -> demangled. Falls back to identity on error.
     """
     if not symbols:
         return {}
-    cppfilt = shutil.which("c++filt")
-    if not cppfilt:
-        return {s: s for s in symbols}
-    try:
-        r = subprocess.run(
-            [cppfilt],
-            input="\n".join(symbols),
-            capture_output=True,
-            text=True,
-            timeout=60,  # was 10 — MKL/TBB can have thousands of symbols
-            check=False,
-        )
-        if r.returncode == 0:
-            demangled = r.stdout.splitlines()
-            return dict(zip(symbols, demangled[:len(symbols)]))
-    except Exception:
-        pass
-    return {s: s for s in symbols}
+    if _IN_PROCESS_DEMANGLE is not None:
+        return {sym: _demangle_in_process(sym) for sym in symbols}
+    return dict(zip(symbols, _CXXFILT.demangle_many(symbols)))
 
 
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
 def demangle_symbol(symbol: str) -> str:
-    """Demangle a single C++ symbol using c++filt.
+    """Demangle a single C++ symbol.
 
     Returns the original symbol if demangling fails.
     Convenience wrapper around demangle_symbols().
@@ -48,56 +184,295 @@ def demangle_symbol(symbol: str) -> str:
     return demangle_symbols([symbol]).get(symbol, symbol)
 
 
+_INTERNAL_PATTERNS = (
+    r"::detail::",
+    r"::backend::",
+    r"::internal::",
+    r"::impl::",
+    r"^mkl_serv_",
+    r"^tbb::",
+    r"^daal::.*::internal::",
+)
+_PREVIEW_PATTERNS = (r"::preview::", r"::experimental::")
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+
+@functools.lru_cache(maxsize=None)
+def pattern_rules(patterns: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...],
+                                                      "Optional[re.Pattern[str]]"]:
+    """Split patterns into literal prefixes, literal substrings and residual regexes.
+
+    ``^literal`` and ``literal`` patterns are answered with ``str.startswith`` /
+    ``in``, which are much cheaper than a regex search; only genuine regexes are
+    compiled (into one alternation).
+    """
+    prefixes, substrings, residual = [], [], []
+    for pattern in patterns:
+        anchored = pattern.startswith("^")
+        body = pattern[1:] if anchored else pattern
+        if _REGEX_METACHARS.isdisjoint(body):
+            (prefixes if anchored else substrings).append(body)
+        else:
+            residual.append(pattern)
+    regex = re.compile("|".join(residual)) if residual else None
+    return tuple(prefixes), tuple(substrings), regex
+
+
+@functools.lru_cache(maxsize=None)
+def _substring_automaton(internal_patterns: Tuple[str, ...], preview_patterns: Tuple[str, ...]):
+    """Aho-Corasick automaton over the literal substrings of both categories.
+
+    Returns None when pyahocorasick is not installed or there are no literal
+    substrings; callers then fall back to one ``in`` test per substring.
+    """
+    if _ahocorasick is None:
+        return None
+    automaton = _ahocorasick.Automaton()
+    # Internal is added last so it wins if a literal appears in both lists.
+    for category, patterns in (("preview", preview_patterns), ("internal", internal_patterns)):
+        for sub in pattern_rules(patterns)[1]:
+            automaton.add_word(sub, category)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def _matches_any(name: str, patterns: Tuple[str, ...], substring_hit: Optional[bool] = None) -> bool:
+    """Whether ``name`` matches any of ``patterns``.
+
+    ``substring_hit`` is the precomputed answer for the literal substrings (from
+    the automaton); None means test them here.
+    """
+    prefixes, substrings, regex = pattern_rules(patterns)
+    if substring_hit is None:
+        substring_hit = any(sub in name for sub in substrings)
+    return (name.startswith(prefixes)
+            or substring_hit
+            or (regex is not None and regex.search(name) is not None))
+
+
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _classify(demangled: str, internal_patterns: Tuple[str, ...] = _INTERNAL_PATTERNS,
+              preview_patterns: Tuple[str, ...] = _PREVIEW_PATTERNS) -> str:
+    """Classify a demangled name; memoised since symbol sets repeat across versions."""
+    automaton = _substring_automaton(internal_patterns, preview_patterns)
+    if automaton is not None:
+        # One automaton pass finds the literal substrings of both categories.
+        hits = {category for _, category in automaton.iter(demangled)}
+        internal_hit, preview_hit = "internal" in hits, "preview" in hits
+    else:
+        internal_hit = preview_hit = None
+    if _matches_any(demangled, internal_patterns, internal_hit):
+        return "internal"
+    if _matches_any(demangled, preview_patterns, preview_hit):
+        return "preview"
+    return "public"
+
+
+# Scope names that make a symbol internal/preview when they appear between two "::".
+_INTERNAL_SCOPES = frozenset(("detail", "backend", "internal", "impl"))
+_PREVIEW_SCOPES = frozenset(("preview", "experimental"))
+
+
+def _mangled_scopes(symbol: str) -> List[str]:
+    """Return the components of an Itanium ``_ZN...E`` nested name.
+
+    Only names made purely of ``<length><identifier>`` pairs closed by ``E``
+    (optionally ending in a constructor/destructor) are parsed:
+    ``_ZN6oneapi3dal6detail3fooEv`` -> ``['oneapi', 'dal', 'detail', 'foo']``.
+    Anything else (template args, substitutions, ABI tags, ...) gives ``[]``;
+    a template function's demangled text starts with its return type, not
+    this chain.
+    """
+    if not symbol.startswith("_ZN"):
+        return []
+    n = len(symbol)
+    i = 3
+    while i < n and symbol[i] in "rVKRO":  # cv- and ref-qualifiers
+        i += 1
+    parts = []
+    while i < n and symbol[i].isdigit():
+        j = i + 1
+        while j < n and symbol[j].isdigit():
+            j += 1
+        end = j + int(symbol[i:j])
+        if end > n:
+            break
+        parts.append(symbol[j:end])
+        i = end
+    if parts and i + 2 < n and symbol[i] in "CD" and symbol[i + 1].isdigit():
+        # Constructor/destructor: demangles to "Class::Class", no return type
+        parts.append(parts[-1])
+        i += 2
+    if i >= n or symbol[i] != "E":
+        return []
+    return parts
+
+
+def _mangled_category(symbol: str) -> Optional[str]:
+    """Decide the category from the mangled form alone, without demangling.
+
+    Only answers for plain nested names (see _mangled_scopes), whose demangled
+    text starts with the scope chain, so the default patterns give the same
+    verdict on it: "internal" for a ``tbb::`` prefix or a
+    ``::detail::``-style scope, "preview" for a ``::preview::``-style scope when
+    no internal name occurs anywhere in the symbol (internal wins over preview).
+    None means "unknown", not "public".
+    """
+    parts = _mangled_scopes(symbol)
+    if len(parts) < 2:
+        return None
+    # A component is surrounded by "::" only if it is neither first nor last.
+    inner = parts[1:-1]
+    if parts[0] == "tbb" or any(p in _INTERNAL_SCOPES for p in inner):
+        return "internal"
+    if any(p in _PREVIEW_SCOPES for p in inner) \
+            and not parts[0].startswith("mkl_serv_") \
+            and not any(name in symbol for name in _INTERNAL_SCOPES):
+        return "preview"
+    return None
+
+
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def classify_symbol(symbol: str) -> str:
+    """Classify a (mangled or demangled) symbol with the default patterns.
+
+    Free-function form of SymbolClassifier().classify(): no instance or
+    attribute lookups, and everything it uses is compiled once per process.
+    Memoised, so symbols that persist across a version history are classified
+    once per run.
+    """
+    if symbol.startswith("_Z"):
+        # Most internal and preview symbols can be recognised from the
+        # mangled scope chain; only demangle when that is inconclusive.
+        category = _mangled_category(symbol)
+        if category is not None:
+            return category
+        symbol = demangle_symbol(symbol)
+    return _classify(symbol)
+
+
 class SymbolClassifier:
-    """Classify C++ symbols into public/preview/internal API buckets."""
+    """Classify C++ symbols into public/preview/internal API buckets.
 
-    def __init__(self) -> None:
-        self.internal_patterns = [
-            r"::detail::",
-            r"::backend::",
-            r"::internal::",
-            r"::impl::",
-            r"^mkl_serv_",
-            r"^tbb::",
-            r"^daal::.*::internal::",
-        ]
-        self.preview_patterns = [r"::preview::", r"::experimental::"]
-        self._internal_re = [re.compile(p) for p in self.internal_patterns]
-        self._preview_re = [re.compile(p) for p in self.preview_patterns]
+    Subclasses may override ``internal_patterns`` / ``preview_patterns``;
+    instances with the default patterns delegate to classify_symbol().
+    """
+
+    internal_patterns = _INTERNAL_PATTERNS
+    preview_patterns = _PREVIEW_PATTERNS
+
+    def _uses_defaults(self) -> bool:
+        return (self.internal_patterns is _INTERNAL_PATTERNS
+                and self.preview_patterns is _PREVIEW_PATTERNS)
+
+    def _classify_mangled(self, symbol: str) -> Optional[str]:
+        """Category of a ``_Z`` symbol if its mangled scope chain settles it, else None.
+
+        The shortcut encodes the default patterns, so it is off for subclasses
+        that override them.
+        """
+        return _mangled_category(symbol) if self._uses_defaults() else None
 
     def classify(self, symbol: str) -> str:
-        demangled = demangle_symbol(symbol) if symbol.startswith("_Z") else symbol
-        for p in self._internal_re:
-            if p.search(demangled):
-                return "internal"
-        for p in self._preview_re:
-            if p.search(demangled):
-                return "preview"
-        return "public"
-
-
-def iter_abidiff_symbols(stdout: str) -> Iterable[Tuple[str, str]]:
-    """Yield (section, raw_symbol) tuples from abidiff stdout."""
+        if self._uses_defaults():
+            return classify_symbol(symbol)
+        if symbol.startswith("_Z"):
+            symbol = demangle_symbol(symbol)
+        return _classify(symbol, tuple(self.internal_patterns), tuple(self.preview_patterns))
+
+
+# Section headers of an abidiff report, tried in this order at the start of the
+# (stripped) line. ELF-level: "N Removed function symbols not referenced by
+# debug info:"; DWARF-level: "N Removed functions:". Any other "...symbols:"
+# header closes the current section.
+_SECTION_RE = re.compile(
+    r"(?:(?=.*?Removed (?:function|variable) symbol)"
+    r"|(?=.*?Removed function)(?=.*functions?:$)"
+    r"|(?=.*?Removed variable)(?=.*variables?:$))(?P<removed>)"
+    r"|(?:(?=.*?Added (?:function|variable) symbol)"
+    r"|(?=.*?Added function)(?=.*functions?:$)"
+    r"|(?=.*?Added variable)(?=.*variables?:$))(?P<added>)"
+    r"|(?=.*?Changed (?:function|variable))(?P<changed>)"
+    r"|(?!.*(?:function|variable) symbols)(?=.*symbols:$)(?P<other>)",
+    re.DOTALL,
+)
+# Cheap pre-check: a line can only be a section header if it contains one of these.
+_SECTION_HINT_RE = re.compile(r"Removed|Added|Changed|symbols:")
+_SYMBOL_MARKERS = ("[D]", "[A]", "[C]")
+# Removed/added counts in the summary lines that open a report.
+_SUMMARY_COUNT_RE = re.compile(r"(\d+) (?:Removed|Added)\b")
+# Any line the parser acts on contains one of these.
+_RELEVANT_RE = re.compile(r"\[[DAC]\]|Removed|Added|Changed|symbols:")
+
+
+def _relevant_lines(text: str) -> Iterable[str]:
+    """Yield only the lines of ``text`` that can be a section header or symbol entry.
+
+    The regex scan skips the bulk of a report (type-change details, source
+    locations) in C instead of handing every line to the Python loop.
+    """
+    search, find, rfind = _RELEVANT_RE.search, text.find, text.rfind
+    pos = 0
+    while True:
+        m = search(text, pos)
+        if m is None:
+            return
+        start = rfind("\n", 0, m.start()) + 1
+        end = find("\n", m.end())
+        if end < 0:
+            end = len(text)
+        yield text[start:end]
+        pos = end + 1
+
+
+def _relevant_stream_lines(stream, chunk_size: int = 1 << 16) -> Iterable[str]:
+    """_relevant_lines() over a text stream, read in chunks rather than per line."""
+    tail = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        cut = chunk.rfind("\n") + 1
+        tail = chunk[cut:]
+        if cut:
+            yield from _relevant_lines(chunk[:cut])
+    if tail:
+        yield from _relevant_lines(tail)
+
+
+def _report_lines(stdout: Union[str, Iterable[str]]) -> Iterable[str]:
+    """Lines of an abidiff report, narrowed to relevant ones for text and streams."""
+    if isinstance(stdout, str):
+        return _relevant_lines(stdout)
+    if hasattr(stdout, "read"):
+        return _relevant_stream_lines(stdout)
+    return stdout
+
+
+def iter_abidiff_symbols(stdout: Union[str, Iterable[str]]) -> Iterable[Tuple[str, str]]:
+    """Yield (section, raw_symbol) tuples from abidiff stdout.
+
+    ``stdout`` is either the whole report or an iterable of its lines (e.g. a
+    process pipe), so large reports can be parsed while they are produced.
+    A whole report, or a text stream with ``read()``, is scanned for relevant
+    lines only, without a splitlines() copy.
+    """
     current_section = None
-    for line in stdout.splitlines():
+    lines = _report_lines(stdout)
+    section_hint, section_match = _SECTION_HINT_RE.search, _SECTION_RE.match
+    for line in lines:
         s = line.strip()
-        # Match ELF-level: "Removed/Added function symbols"
-        # Match DWARF-level: "N Removed functions:" / "N Added functions:"
-        if "Removed function symbol" in s or "Removed variable symbol" in s \
-                or ("Removed function" in s and (s.endswith("functions:") or s.endswith("function:"))) \
-                or ("Removed variable" in s and (s.endswith("variables:") or s.endswith("variable:"))):
-            current_section = "removed"
-        elif "Added function symbol" in s or "Added variable symbol" in s \
-                or ("Added function" in s and (s.endswith("functions:") or s.endswith("function:"))) \
-                or ("Added variable" in s and (s.endswith("variables:") or s.endswith("variable:"))):
-            current_section = "added"
-        elif "Changed function" in s or "Changed variable" in s:
-            current_section = "changed"
-        elif s.endswith("symbols:") and "function symbols" not in s \
-                and "variable symbols" not in s:
-            current_section = None
-        elif (s.startswith("[D]") or s.startswith("[A]") or s.startswith("[C]")) \
-                and current_section:
+        if not s:
+            continue
+        if s[0] != "[" or not s.startswith(_SYMBOL_MARKERS):
+            m = section_match(s) if section_hint(s) else None
+            if m is not None:
+                current_section = None if m.lastgroup == "other" else m.lastgroup
+        elif current_section:
             parts = s.split(maxsplit=1)
             symbol = parts[1] if len(parts) > 1 else ""
             # Strip trailing mangled form e.g. {_ZNxxx}
@@ -105,30 +480,95 @@ def iter_abidiff_symbols(stdout: str) -> Iterable[Tuple[str, str]]:
             yield current_section, symbol
 
 
-def parse_abidiff_symbols(stdout: str, classifier: SymbolClassifier) -> CategoryStats:
+def _delta_entries(stdout: Union[str, Iterable[str]]) -> List[Tuple[str, str]]:
+    """iter_abidiff_symbols() as a list, for callers that only count removed/added.
+
+    When the summary lines that open the report show nothing removed or added,
+    only changed entries can follow, so the rest of the report is not read and
+    no entries are returned.
+    """
+    lines = iter(_report_lines(stdout))
+    saw_summary = has_delta = False
+    for line in lines:
+        s = line.strip()
+        if not s:
+            continue
+        if "summary:" not in s:
+            break
+        saw_summary = True
+        has_delta = has_delta or any(n != "0" for n in _SUMMARY_COUNT_RE.findall(s))
+    else:
+        return []
+    if saw_summary and not has_delta:
+        return []
+    return list(iter_abidiff_symbols(itertools.chain((line,), lines)))
+
+
+def _demangle_entries(entries: List[Tuple[str, str]],
+                      known: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Demangle every distinct ``_Z`` symbol in ``entries`` with one batch.
+
+    Symbols in ``known`` (already classified from their mangled form) are left
+    out, since classification never needs their text.
+    """
+    mangled = list(dict.fromkeys(
+        sym for _, sym in entries
+        if sym.startswith("_Z") and not (known and sym in known)
+    ))
+    return demangle_symbols(mangled)
+
+
+def parse_abidiff_symbols(stdout: Union[str, Iterable[str]], classifier: SymbolClassifier) -> CategoryStats:
     """Parse abidiff output and classify symbol delta counts by category."""
     stats: CategoryStats = {
         "public": {"removed": 0, "added": 0},
         "preview": {"removed": 0, "added": 0},
         "internal": {"removed": 0, "added": 0},
     }
-    for section, symbol in iter_abidiff_symbols(stdout):
-        cat = classifier.classify(symbol)
-        if cat in stats:
+    entries = _delta_entries(stdout)
+    known: Dict[str, str] = {}
+    # Any object with classify() will do; the mangled-name shortcut is optional.
+    classify_mangled = getattr(classifier, "_classify_mangled", None)
+    if classify_mangled is not None:
+        for _, symbol in entries:
+            if symbol.startswith("_Z") and symbol not in known:
+                category = classify_mangled(symbol)
+                if category is not None:
+                    known[symbol] = category
+    demangled = _demangle_entries(entries, known)
+    for section, symbol in entries:
+        cat = known.get(symbol) or classifier.classify(demangled.get(symbol, symbol))
+        if cat in stats and section in stats[cat]:
             stats[cat][section] += 1
     return stats
 
 
-def extract_symbol_lists(stdout: str, classifier: SymbolClassifier) -> CategorySymbols:
-    """Extract per-category lists of added/removed symbols from abidiff output."""
+def parse_abidiff(stdout: Union[str, Iterable[str]], classifier: SymbolClassifier) -> CategorySymbols:
+    """Demangle and classify every added/removed symbol of an abidiff report in one pass.
+
+    Returns per-category lists of demangled names; use symbol_stats() for counts.
+    """
     result: CategorySymbols = {
         "public": {"removed": [], "added": []},
         "preview": {"removed": [], "added": []},
         "internal": {"removed": [], "added": []},
     }
-    for section, symbol in iter_abidiff_symbols(stdout):
-        demangled = demangle_symbol(symbol) if symbol.startswith("_Z") else symbol
-        cat = classifier.classify(demangled)
-        if cat in result:
-            result[cat][section].append(demangled)
+    entries = _delta_entries(stdout)
+    names = _demangle_entries(entries)
+    for section, symbol in entries:
+        demangled = names.get(symbol, symbol)
+        bucket = result.get(classifier.classify(demangled))
+        if bucket is not None and section in bucket:
+            bucket[section].append(demangled)
     return result
+
+
+def symbol_stats(symbols: CategorySymbols) -> CategoryStats:
+    """Collapse per-category symbol lists (from parse_abidiff) into counts."""
+    return {cat: {action: len(names) for action, names in actions.items()}
+            for cat, actions in symbols.items()}
+
+
+def extract_symbol_lists(stdout: str, classifier: SymbolClassifier) -> CategorySymbols:
+    """Extract per-category lists of added/removed symbols from abidiff output."""
+    return parse_abidiff(stdout, classifier)
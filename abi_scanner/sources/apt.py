@@ -3,6 +3,7 @@
 import sys
 
 import subprocess
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import List, Optional
 import gzip
@@ -12,7 +13,7 @@ import urllib.error
 from urllib.parse import urlparse, unquote as _url_unquote
 
 from .base import PackageSource
-from .utils import safe_extract_tar
+from .utils import open_tar, safe_extract_tar, walk_files
 
 
 import os
@@ -340,8 +341,6 @@ class AptSource(PackageSource):
         # .deb structure: ar archive with debian-binary, control.tar.*, data.tar.*
         # We only need data.tar.* (contains actual files)
         
-        import tarfile
-        
         with tempfile.TemporaryDirectory() as tmpdir:
             tmpdir = Path(tmpdir)
             
@@ -364,7 +363,7 @@ class AptSource(PackageSource):
                 raise RuntimeError(f"No data.tar.* found in {package_file}")
             
             # Extract data.tar.* safely (prevent path traversal CVE-2007-4559)
-            with tarfile.open(data_tar[0]) as tar:
+            with open_tar(data_tar[0]) as tar:
                 safe_extract_tar(tar, extract_dir)
         
         return extract_dir
@@ -390,8 +389,8 @@ class AptSource(PackageSource):
         pattern = f"*{package_name}*.so*" if package_name else "*.so*"
 
         for search_dir in search_dirs:
-            if search_dir.exists():
-                for lib in search_dir.rglob(pattern):
+            for lib in walk_files(search_dir):
+                if fnmatchcase(lib.name, pattern):
                     libraries.add(lib)
 
         return sorted(libraries)
@@ -411,8 +410,7 @@ class AptSource(PackageSource):
         ]
         
         for search_dir in search_dirs:
-            if search_dir.exists():
-                for ext in ['*.h', '*.hpp', '*.hxx']:
-                    headers.extend(search_dir.rglob(ext))
+            headers.extend(h for h in walk_files(search_dir)
+                           if h.name.endswith(('.h', '.hpp', '.hxx')))
         
         return sorted(headers)
@@ -1,12 +1,40 @@
 """Conda/Anaconda package source adapter."""
 
+import os
 import subprocess
 import json
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import List
 
+from packaging.version import InvalidVersion, Version
+
 from .base import PackageSource
-from .utils import safe_extract_tar, safe_extract_zip
+from .utils import open_tar, safe_extract_tar, safe_extract_zip, walk_files
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# orjson parses the (possibly multi-MB) search output straight from bytes;
+# stdlib json.loads accepts bytes too. orjson's JSONDecodeError subclasses
+# json.JSONDecodeError, so one except clause covers both.
+_json_loads = _orjson.loads if _orjson is not None else json.loads
+
+
+def _match_entries(directory: Path, *patterns: str) -> List[Path]:
+    """Non-directory entries of ``directory`` whose name matches any pattern.
+
+    One ``os.scandir`` pass replaces a ``Path.glob`` per pattern; symlinks are
+    kept since conda packages ship versioned ``.so`` links.
+    """
+    with os.scandir(directory) as it:
+        return [
+            Path(entry.path) for entry in it
+            if not entry.is_dir(follow_symlinks=False)
+            and any(fnmatchcase(entry.name, p) for p in patterns)
+        ]
 
 
 class CondaSource(PackageSource):
@@ -54,7 +82,7 @@ class CondaSource(PackageSource):
         try:
             result = subprocess.run(
                 [self.executable, "search", "-c", self.channel, package, "--json"],
-                capture_output=True, text=True, check=False, timeout=60,
+                capture_output=True, check=False, timeout=60,
             )
         except FileNotFoundError:
             raise RuntimeError(
@@ -66,7 +94,7 @@ class CondaSource(PackageSource):
             ) from None
 
         if result.returncode != 0:
-            stderr = result.stderr.strip()
+            stderr = result.stderr.decode(errors="replace").strip()
             if "PackagesNotFoundError" in stderr or "nothing provides" in stderr.lower():
                 return []  # package genuinely absent from channel
             raise RuntimeError(
@@ -74,18 +102,17 @@ class CondaSource(PackageSource):
             )
 
         try:
-            data = json.loads(result.stdout)
+            data = _json_loads(result.stdout)
         except json.JSONDecodeError as exc:
             raise RuntimeError(f"micromamba search returned invalid JSON: {exc}") from exc
 
-        versions = list({
+        versions = {
             pkg["version"]
             for pkg in data.get("result", {}).get("pkgs", [])
-        })
-        from packaging.version import Version
+        }
         try:
-            return sorted(versions, key=lambda v: Version(v))
-        except Exception:
+            return sorted(versions, key=Version)
+        except InvalidVersion:
             return sorted(versions)
 
     def download(self, package_name: str, version: str, output_dir: Path) -> Path:
@@ -163,8 +190,7 @@ class CondaSource(PackageSource):
                 return pkg_dir
         else:
             # Old .tar.bz2 format - extract safely
-            import tarfile
-            with tarfile.open(package_file) as tar:
+            with open_tar(package_file) as tar:
                 safe_extract_tar(tar, extract_dir)
         
         return extract_dir
@@ -182,13 +208,13 @@ class CondaSource(PackageSource):
         # Linux/macOS
         lib_dir = extract_dir / 'lib'
         if lib_dir.exists():
-            libraries.extend(lib_dir.glob(f"lib{package_name}*.so*"))
-            libraries.extend(lib_dir.glob(f"lib{package_name}*.dylib"))
+            libraries.extend(_match_entries(
+                lib_dir, f"lib{package_name}*.so*", f"lib{package_name}*.dylib"))
         
         # Windows
         win_bin = extract_dir / 'Library' / 'bin'
         if win_bin.exists():
-            libraries.extend(win_bin.glob(f"{package_name}*.dll"))
+            libraries.extend(_match_entries(win_bin, f"{package_name}*.dll"))
         
         return sorted(libraries)
     
@@ -199,11 +225,7 @@ class CondaSource(PackageSource):
         - include/**/*.h
         - include/**/*.hpp
         """
-        headers = []
-        include_dir = extract_dir / 'include'
-        
-        if include_dir.exists():
-            for ext in ['*.h', '*.hpp', '*.hxx']:
-                headers.extend(include_dir.rglob(ext))
+        headers = [h for h in walk_files(extract_dir / 'include')
+                   if h.name.endswith(('.h', '.hpp', '.hxx'))]
         
         return sorted(headers)
@@ -1,11 +1,11 @@
 """Local filesystem package source adapter."""
 
-import shutil
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import List
 
 from .base import PackageSource
-from .utils import safe_extract_tar, safe_extract_zip
+from .utils import open_tar, safe_extract_tar, safe_extract_zip, walk_files
 
 
 class LocalSource(PackageSource):
@@ -20,39 +20,26 @@ class LocalSource(PackageSource):
     """
     
     def download(self, package_name: str, version: str, output_dir: Path) -> Path:
-        """'Download' (copy) a local package file.
+        """'Download' a local package file or directory.
+        
+        Nothing is copied: later steps only read the package (extract() writes
+        into its own directory), so the resolved source path is returned.
         
         Args:
-            package_name: Path to local package file (can be relative or absolute)
+            package_name: Path to local package file or pre-extracted
+                directory (can be relative or absolute)
             version: Ignored (local files don't have version discovery)
-            output_dir: Directory to copy package into
+            output_dir: Ignored (kept for the PackageSource interface)
             
         Returns:
-            Path to the copied package file in output_dir
+            Resolved path of the local package
         """
         source_path = Path(package_name).expanduser().resolve()
         
         if not source_path.exists():
             raise FileNotFoundError(f"Local package not found: {source_path}")
         
-        if source_path.is_dir():
-            # If it's a directory, assume it's pre-extracted
-            # Just return the path (no copy needed)
-            return source_path
-        
-        # Copy file to output_dir
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_file = output_dir / source_path.name
-        
-        if output_file.exists() and output_file.samefile(source_path):
-            # Already in the right place
-            return output_file
-        
-        # Overwrite stale file or copy new file
-        print(f"Copying {source_path.name}...")
-        shutil.copy2(source_path, output_file)
-        
-        return output_file
+        return source_path
     
     def extract(self, package_file: Path, extract_dir: Path) -> Path:
         """Extract a local package file.
@@ -81,8 +68,7 @@ class LocalSource(PackageSource):
                 raise RuntimeError("dpkg-deb not found. Install dpkg.") from e
         
         elif suffix in ['.bz2', '.gz', '.xz'] or package_file.name.endswith('.tar.bz2'):
-            import tarfile
-            with tarfile.open(package_file) as tar:
+            with open_tar(package_file) as tar:
                 safe_extract_tar(tar, extract_dir)
         
         elif suffix == '.conda':
@@ -115,12 +101,11 @@ class LocalSource(PackageSource):
         Searches recursively for .so* (Linux), .dylib (macOS), .dll (Windows).
         Optionally filters by package_name.
         """
-        libraries = []
-        
-        # Search for all shared libraries
-        libraries.extend(extract_dir.rglob('*.so*'))
-        libraries.extend(extract_dir.rglob('*.dylib'))
-        libraries.extend(extract_dir.rglob('*.dll'))
+        # Search for all shared libraries in a single walk
+        libraries = [
+            path for path in walk_files(extract_dir)
+            if fnmatchcase(path.name, '*.so*') or path.name.endswith(('.dylib', '.dll'))
+        ]
         
         # Filter by package name if provided
         if package_name:
@@ -137,10 +122,7 @@ class LocalSource(PackageSource):
         Searches recursively for .h, .hpp, .hxx files.
         Filters for include/ directories to reduce noise.
         """
-        headers = []
-        
-        for ext in ['*.h', '*.hpp', '*.hxx']:
-            headers.extend(extract_dir.rglob(ext))
+        headers = [h for h in walk_files(extract_dir) if h.name.endswith(('.h', '.hpp', '.hxx'))]
         
         # Filter for include/ directories (heuristic to reduce noise)
         headers = [h for h in headers if '/include/' in str(h) or '\\include\\' in str(h)]
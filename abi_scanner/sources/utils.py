@@ -1,9 +1,103 @@
-"""Utility functions for safe package extraction."""
+"""Utility functions for safe package extraction and walking extracted trees."""
 
+import bz2
+import contextlib
+import gzip
+import lzma
 import os
+import shutil
+import tempfile
 from pathlib import Path
 import tarfile
 import zipfile
+from typing import Iterator, List, Tuple
+
+# Magic prefix -> opener for the compressions tarfile itself understands
+_TAR_DECOMPRESSORS = (
+    (b"BZh", bz2.open),
+    (b"\x1f\x8b", gzip.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+# Decompressed tarballs up to this size stay in memory, larger ones spill to disk
+_TAR_SPOOL_MAX = 64 << 20
+_HEADER_SUFFIXES = frozenset((".h", ".hpp", ".hxx"))
+
+
+def scan_entries(root: Path) -> Iterator[os.DirEntry]:
+    """Yield an os.DirEntry for every non-directory entry below root.
+
+    Cheaper than several ``Path.rglob`` calls over the same tree: each
+    directory is read once and no extra stat() is made per entry. Like
+    rglob, symlinked directories are not descended into (the link itself is
+    yielded, as are symlinks to files). Unreadable directories are skipped.
+
+    Args:
+        root: Directory to walk (a missing directory yields nothing)
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    yield entry
+
+
+def walk_files(root: Path) -> Iterator[Path]:
+    """Yield the path of every non-directory entry below root (see scan_entries)."""
+    for entry in scan_entries(root):
+        yield Path(entry.path)
+
+
+def scan_tree(root: Path) -> Tuple[List[Path], List[Path]]:
+    """Walk root once and return (headers, shared_objects) as lists of Paths.
+
+    Headers are files ending in .h/.hpp/.hxx; shared objects are any file
+    whose name contains ".so" (libfoo.so, libfoo.so.3, ...), including
+    symlinks. Directory symlinks are not followed.
+    """
+    headers, libs = [], []
+    for entry in scan_entries(root):
+        if os.path.splitext(entry.name)[1] in _HEADER_SUFFIXES:
+            headers.append(Path(entry.path))
+        elif ".so" in entry.name:
+            libs.append(Path(entry.path))
+    return headers, libs
+
+
+@contextlib.contextmanager
+def open_tar(path: Path) -> Iterator[tarfile.TarFile]:
+    """Open a tarball, compressed or not, for use with safe_extract_tar.
+
+    safe_extract_tar lists every member before extracting, and on a
+    compressed TarFile the seek back to the first member restarts
+    decompression from scratch. Compressed archives are therefore
+    decompressed once into a spooled temporary file and read from there.
+
+    Raises:
+        tarfile.ReadError: If the archive is corrupt or not a tarball
+    """
+    with open(path, "rb") as f:
+        magic = f.read(6)
+    opener = next((fn for sig, fn in _TAR_DECOMPRESSORS if magic.startswith(sig)), None)
+    if opener is None:
+        with tarfile.open(path) as tar:
+            yield tar
+        return
+    with tempfile.SpooledTemporaryFile(max_size=_TAR_SPOOL_MAX) as spool:
+        try:
+            with opener(path) as src:
+                shutil.copyfileobj(src, spool, 1 << 20)
+        except (OSError, EOFError, lzma.LZMAError) as e:
+            raise tarfile.ReadError(f"{path}: {e}") from e
+        spool.seek(0)
+        with tarfile.open(fileobj=spool, mode="r:") as tar:
+            yield tar
 
 
 def safe_extract_tar(tar: tarfile.TarFile, extract_dir: Path):
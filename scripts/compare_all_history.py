@@ -9,10 +9,21 @@ This script automates ABI compatibility analysis by:
 - Reporting public, preview, and internal API changes separately
 """
 import argparse
+import contextlib
+import functools
+import io
 import os
+import pickle
 import re
+import struct
 import subprocess
 import shutil as _shutil
+import tarfile
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 def _find_micromamba():
     """Find micromamba binary: PATH, common locations, or MAMBA_ROOT_PREFIX/bin."""
@@ -34,6 +45,7 @@ def _get_micromamba() -> str:
     if _MICROMAMBA_CACHE is None:
         _MICROMAMBA_CACHE = _find_micromamba()
     return _MICROMAMBA_CACHE
+import hashlib
 import json
 import logging
 
@@ -42,24 +54,84 @@ try:
     import yaml as _yaml
 except ImportError:
     _yaml = None
-from collections import defaultdict
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+try:
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+# orjson parses bytes directly and is several times faster on multi-MB
+# micromamba output; stdlib json.loads also accepts bytes as a fallback.
+_json_loads = _orjson.loads if _orjson is not None else json.loads
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import Optional, Tuple, Dict, List
+from typing import Callable, Optional, Tuple, Dict, List
 import sys
 
+from packaging.version import InvalidVersion, Version
+
 # Import shared extract_namespace to avoid duplicating regex logic
 from abi_scanner.analyzer import extract_namespace
 from abi_scanner.module_scanner import (
     SymbolClassifier,
+    classify_symbol,
     demangle_symbol,
     extract_symbol_lists,
-    parse_abidiff_symbols,
+    parse_abidiff,
+    symbol_stats,
 )
+from abi_scanner.sources.utils import scan_entries, walk_files
+
+
+def _json_dump_indented(data, path: Path) -> None:
+    """Write ``data`` as 2-space indented JSON, via orjson when it is installed."""
+    if _orjson is not None:
+        path.write_bytes(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+# Wall time and run counts per pipeline phase ("download", "abidw", "abidiff"),
+# plus how many tool runs the caches avoided; reported with --verbose.
+_phase_lock = threading.Lock()
+_phase_times: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+_phase_skipped: Counter = Counter()
+
+
+@contextlib.contextmanager
+def _timed(phase: str):
+    """Add the wall time of the ``with`` body to ``phase`` (thread-safe)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _phase_lock:
+            totals = _phase_times[phase]
+            totals[0] += 1
+            totals[1] += elapsed
+
+
+def _skipped(phase: str) -> None:
+    """Record that a cache hit saved one run of ``phase``."""
+    with _phase_lock:
+        _phase_skipped[phase] += 1
+
+
+def _print_phase_times() -> None:
+    for phase in sorted(set(_phase_times) | set(_phase_skipped)):
+        runs, seconds = _phase_times.get(phase, (0, 0.0))
+        print(f"{phase}: {runs} run(s) in {seconds:.2f}s, {_phase_skipped[phase]} skipped")
 
 
 # ── APT channel support ───────────────────────────────────────────────────────
 import gzip as _gzip
 import re as _apt_re
+import urllib.error as _urllib_err
 import urllib.request as _urllib_req
 
 INTEL_APT_BASE = 'https://apt.repos.intel.com/oneapi'
@@ -124,7 +196,6 @@ def download_and_extract_apt(version: str, filename: str, cache_dir: Path,
                               apt_base: str = INTEL_APT_BASE,
                               verbose: bool = False) -> Optional[Path]:
     """Download .deb from Intel APT and extract it. Returns extract dir."""
-    import subprocess as _sp
     deb_name = Path(filename).name
     deb_path = cache_dir / f'apt_{deb_name}'
     extract_dir = cache_dir / f'apt_extract_{version}'
@@ -144,12 +215,11 @@ def download_and_extract_apt(version: str, filename: str, cache_dir: Path,
     if not extract_dir.exists():
         extract_dir.mkdir(parents=True)
         try:
-            _sp.run(['dpkg-deb', '-x', str(deb_path), str(extract_dir)],
-                    check=True, capture_output=True)
+            subprocess.run(['dpkg-deb', '-x', str(deb_path), str(extract_dir)],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception as exc:
             print(f'  Extraction failed: {exc}', file=sys.stderr)
-            import shutil as _cleanup_shutil
-            _cleanup_shutil.rmtree(extract_dir, ignore_errors=True)
+            _shutil.rmtree(extract_dir, ignore_errors=True)
             return None
     return extract_dir
 
@@ -177,35 +247,316 @@ def find_library_apt(extract_dir: Path, library_name: str,
     return None
 
 # ─────────────────────────────────────────────────────────────────────────────
-def get_package_versions(channel, package):
+def get_package_versions(channel, package, root_prefix: Optional[Path] = None,
+                         cache_dir: Optional[Path] = None, ttl: float = 0,
+                         base_url: Optional[str] = None):
     """Get all available versions for a package from conda channel.
 
     Args:
         channel: Conda channel name (e.g., 'conda-forge')
         package: Package name (e.g., 'dal')
+        root_prefix: Optional micromamba root prefix; sharing it with
+            download_packages() lets the repodata fetched here be reused
+        cache_dir: Optional directory to keep the raw search result (and the
+            repodata index) in
+        ttl: Seconds a cached search result stays valid; 0 disables the cache
+        base_url: Optional conda server URL; the versions are then read from
+            the channel repodata index (see _conda_repodata) when it can be
+            fetched, and micromamba search is the fallback
 
     Returns:
         List of version strings sorted by packaging.version.Version
     """
-    result = subprocess.run(
-        [_get_micromamba(), "search", "-c", channel, package, "--json"],
-        capture_output=True, text=True, check=False
-    )
+    cache_path = None
+    if cache_dir is not None and ttl > 0:
+        cache_path = cache_dir / re.sub(r"[^\w.-]", "_", f"versions_{channel}_{package}.json")
+        try:
+            if time.time() - cache_path.stat().st_mtime < ttl:
+                return _parse_versions(_json_loads(cache_path.read_bytes()))
+        except (OSError, ValueError):
+            pass
+    if base_url:
+        versions = _repodata_versions(channel, package, base_url, cache_dir)
+        if versions is not None:
+            return versions
+    cmd = [_get_micromamba(), "search", "-c", channel, package, "--json"]
+    if root_prefix is not None:
+        cmd[2:2] = ["-r", str(root_prefix)]
+    result = subprocess.run(cmd, capture_output=True, check=False)
     if result.returncode != 0:
         return []
-    data = json.loads(result.stdout)
-    versions = list(set(pkg["version"] for pkg in data.get("result", {}).get("pkgs", [])))
-    from packaging.version import Version
+    data = _json_loads(result.stdout)
+    if cache_path is not None:
+        tmp = _tmp_sibling(cache_path)
+        try:
+            tmp.write_bytes(result.stdout)
+            os.replace(tmp, cache_path)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return _parse_versions(data)
+
+
+def _parse_versions(data: Dict) -> List[str]:
+    """Sorted distinct versions from ``micromamba search --json`` output."""
+    return _sort_versions({pkg["version"] for pkg in data.get("result", {}).get("pkgs", [])})
+
+
+def _sort_versions(versions) -> List[str]:
+    """Sort version strings by packaging.version.Version, lexically if any is unparsable."""
     try:
-        return sorted(versions, key=lambda v: Version(v))
-    except Exception:
+        return sorted(versions, key=Version)
+    except InvalidVersion:
         return sorted(versions)
 
 
+CONDA_BASE_URL = "https://conda.anaconda.org"
+_CONDA_SUBDIRS = ("linux-64", "noarch")
+_repodata_cache: Dict[str, Optional[Dict]] = {}
+_repodata_lock = threading.Lock()
+
+
+def _channel_url(channel: str, base_url: str) -> str:
+    """Full URL of a channel given by name (or already as a URL)."""
+    if "://" in channel:
+        return channel.rstrip("/")
+    return f"{base_url.rstrip('/')}/{channel}"
+
+
+def _index_repodata(data: Dict) -> Dict[Tuple[str, str], List[Tuple[str, Dict]]]:
+    """Group repodata.json records by (name, version), keeping only the fields used here."""
+    index = defaultdict(list)
+    for key in ("packages", "packages.conda"):
+        for fn, rec in (data.get(key) or {}).items():
+            index[(rec.get("name"), rec.get("version"))].append((fn, {
+                "build_number": rec.get("build_number", 0),
+                "timestamp": rec.get("timestamp", 0),
+            }))
+    return dict(index)
+
+
+def _fetch_repodata_index(subdir_url: str, cache_dir: Optional[Path]):
+    """Fetch and index repodata.json, reusing an on-disk index while its ETag is current.
+
+    The parsed index is pickled under cache_dir/repodata; later runs send the
+    stored ETag and, on 304 Not Modified, load the pickle instead of
+    downloading and parsing the (very large) JSON again.
+    """
+    pkl = etag_file = None
+    etag = None
+    if cache_dir is not None:
+        stem = re.sub(r"[^\w.-]", "_", subdir_url)
+        pkl = cache_dir / "repodata" / f"{stem}.pkl"
+        etag_file = pkl.with_suffix(".etag")
+        if pkl.exists() and etag_file.exists():
+            etag = etag_file.read_text().strip() or None
+    request = _urllib_req.Request(f"{subdir_url}/repodata.json",
+                                  headers={"Accept-Encoding": "gzip"})
+    if etag:
+        request.add_header("If-None-Match", etag)
+    try:
+        resp = _urllib_req.urlopen(request, timeout=60)
+    except _urllib_err.HTTPError as exc:
+        if exc.code == 304 and pkl is not None:
+            with open(pkl, "rb") as f:
+                return pickle.load(f)
+        raise
+    with resp:
+        raw = resp.read()
+        new_etag = resp.headers.get("ETag")
+        if resp.headers.get("Content-Encoding") == "gzip":
+            raw = _gzip.decompress(raw)
+    index = _index_repodata(_json_loads(raw))
+    if pkl is not None and new_etag:
+        pkl.parent.mkdir(parents=True, exist_ok=True)
+        for path, write in ((pkl, lambda f: pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)),
+                            (etag_file, lambda f: f.write(new_etag.encode()))):
+            tmp = _tmp_sibling(path)
+            try:
+                with open(tmp, "wb") as f:
+                    write(f)
+                os.replace(tmp, path)
+            finally:
+                tmp.unlink(missing_ok=True)
+    return index
+
+
+def _conda_repodata(subdir_url: str, cache_dir: Optional[Path] = None
+                    ) -> Optional[Dict[Tuple[str, str], List[Tuple[str, Dict]]]]:
+    """Index one channel subdir's repodata.json by (name, version).
+
+    Fetched and parsed at most once per run, even with concurrent builds, and
+    kept on disk across runs when cache_dir is given.
+
+    Returns:
+        Mapping (name, version) -> [(filename, record), ...], or None if the
+        repodata could not be fetched
+    """
+    with _repodata_lock:
+        if subdir_url not in _repodata_cache:
+            try:
+                _repodata_cache[subdir_url] = _fetch_repodata_index(subdir_url, cache_dir)
+            except (OSError, ValueError, pickle.UnpicklingError, EOFError) as exc:
+                print(f"  repodata fetch failed for {subdir_url}: {exc}", file=sys.stderr)
+                _repodata_cache[subdir_url] = None
+        return _repodata_cache[subdir_url]
+
+
+def _repodata_versions(channel: str, package: str, base_url: str,
+                       cache_dir: Optional[Path] = None) -> Optional[List[str]]:
+    """Versions of package listed in the channel's repodata, or None if unavailable."""
+    channel_url = _channel_url(channel, base_url)
+    versions = set()
+    fetched = False
+    for subdir in _CONDA_SUBDIRS:
+        index = _conda_repodata(f"{channel_url}/{subdir}", cache_dir)
+        if index is None:
+            continue
+        fetched = True
+        versions.update(ver for name, ver in index if name == package)
+    return _sort_versions(versions) if fetched else None
+
+
+def _pick_package_file(candidates: List[Tuple[str, Dict]]) -> Optional[str]:
+    """Filename of the newest build among candidates; .conda files need zstandard."""
+    best, best_key = None, None
+    for fn, rec in candidates:
+        is_conda = fn.endswith(".conda")
+        if is_conda and _zstd is None:
+            continue
+        key = (rec.get("build_number", 0), rec.get("timestamp", 0), is_conda)
+        if best_key is None or key > best_key:
+            best, best_key = fn, key
+    return best
+
+
+_SHARED_OBJECT_RE = re.compile(r"\.so(?:\.|$)")
+
+
+def _is_shared_object(member_name: str) -> bool:
+    """True for ``libfoo.so`` / ``libfoo.so.1.2`` style archive member names."""
+    return _SHARED_OBJECT_RE.search(member_name.rsplit("/", 1)[-1]) is not None
+
+
+def _extract_tar_stream(tar: tarfile.TarFile, dest: Path,
+                        keep: Optional[Callable[[str], bool]] = None) -> None:
+    """Extract regular files of a streamed tar into dest.
+
+    Links and special files are skipped (the libraries they point at are
+    regular files), as are files ``keep`` rejects; members escaping dest are
+    rejected. Parent directories are created as needed.
+    """
+    for member in tar:
+        if not member.isfile() or (keep is not None and not keep(member.name)):
+            continue
+        if member.name.startswith("/") or ".." in Path(member.name).parts:
+            raise RuntimeError(f"Unsafe path in package: {member.name}")
+        try:
+            tar.extract(member, dest, filter="data")
+        except TypeError:
+            # Python < 3.12 without the extraction filter backport
+            tar.extract(member, dest)
+
+
+def _extract_conda_package(pkg_file: Path, dest: Path,
+                           keep: Optional[Callable[[str], bool]] = None) -> None:
+    """Unpack a .conda or .tar.bz2 package (the files ``keep`` accepts) into dest."""
+    if pkg_file.name.endswith(".conda"):
+        with zipfile.ZipFile(pkg_file) as zf:
+            inner = [n for n in zf.namelist() if n.startswith("pkg-") and n.endswith(".tar.zst")]
+            if not inner:
+                raise RuntimeError(f"No pkg-*.tar.zst in {pkg_file.name}")
+            with zf.open(inner[0]) as raw, \
+                    _zstd.ZstdDecompressor().stream_reader(raw) as stream, \
+                    tarfile.open(fileobj=stream, mode="r|") as tar:
+                _extract_tar_stream(tar, dest, keep)
+    else:
+        with tarfile.open(pkg_file, mode="r|bz2") as tar:
+            _extract_tar_stream(tar, dest, keep)
+
+
+def download_conda_direct(channel: str, packages: List[Tuple[str, str]], env_path: Path,
+                          base_url: str = CONDA_BASE_URL, verbose: bool = False,
+                          cache_dir: Optional[Path] = None,
+                          keep: Optional[Callable[[str, str], bool]] = None) -> bool:
+    """Fetch exact package files from a conda channel and unpack them into env_path.
+
+    Skips the solver and every transitive dependency: abidw only needs the
+    package's own files. The channel repodata is read once per run.
+
+    Args:
+        channel: Conda channel name or URL
+        packages: (name, version) pairs to fetch
+        env_path: Directory to unpack into
+        base_url: Conda server hosting named channels
+        verbose: Enable verbose output
+        cache_dir: Optional directory for the on-disk repodata index
+        keep: Optional ``keep(package_name, member_name)`` filter; only the
+            package files it accepts are written to disk
+
+    Returns:
+        True if every package was downloaded and unpacked, False otherwise
+    """
+    channel_url = _channel_url(channel, base_url)
+    urls = []
+    for name, version in packages:
+        for subdir in _CONDA_SUBDIRS:
+            index = _conda_repodata(f"{channel_url}/{subdir}", cache_dir)
+            fn = _pick_package_file(index.get((name, version), ())) if index else None
+            if fn:
+                urls.append((name, f"{channel_url}/{subdir}/{fn}"))
+                break
+        else:
+            return False
+    env_path.mkdir(parents=True, exist_ok=True)
+    for name, url in urls:
+        fn = url.rsplit("/", 1)[1]
+        if verbose:
+            print(f"  Fetching {url}")
+        member_filter = functools.partial(keep, name) if keep is not None else None
+        try:
+            with tempfile.TemporaryDirectory(prefix="abi_pkg_") as tmpdir:
+                pkg_file = Path(tmpdir) / fn
+                _urllib_req.urlretrieve(url, pkg_file)
+                _extract_conda_package(pkg_file, env_path, member_filter)
+        except (OSError, RuntimeError, tarfile.TarError, zipfile.BadZipFile) as exc:
+            if verbose:
+                print(f"  Fetching {fn} failed: {exc}")
+            return False
+    return True
+
+
+def get_cached_versions(cache_dir: Path, package: str, lib_tag: str) -> List[str]:
+    """List versions that already have a baseline in cache_dir.
+
+    Args:
+        cache_dir: Baseline cache directory
+        package: Package name used in baseline file names
+        lib_tag: Library tag used in baseline file names ("all" by default)
+
+    Returns:
+        List of version strings sorted by packaging.version.Version
+    """
+    name_re = re.compile(rf"{re.escape(package)}_{re.escape(lib_tag)}_(.+)\.abi(?:\.zst|\.gz)?")
+    versions = set()
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            m = name_re.fullmatch(entry.name)
+            if m:
+                versions.add(m.group(1))
+    return _sort_versions(versions)
+
+
 def download_packages(channel: str, package: str, version: str, env_path: Path,
-                      devel_package: Optional[str] = None, verbose: bool = False) -> bool:
+                      devel_package: Optional[str] = None, verbose: bool = False,
+                      root_prefix: Optional[Path] = None,
+                      base_url: Optional[str] = None,
+                      cache_dir: Optional[Path] = None) -> bool:
     """Download runtime and optional development packages into environment.
 
+    With ``base_url`` the package files are fetched straight from the channel
+    and unpacked (see download_conda_direct); micromamba is used only when
+    that is not possible.
+
     Args:
         channel: Conda channel name
         package: Runtime package name
@@ -213,30 +564,101 @@ def download_packages(channel: str, package: str, version: str, env_path: Path,
         env_path: Path to target environment
         devel_package: Optional development package name (e.g., 'dal-devel')
         verbose: Enable verbose output
+        root_prefix: micromamba root prefix holding the repodata and package
+            caches; pass the same directory for every version so they are
+            downloaded and parsed once per run instead of once per version.
+            Defaults to a private root next to env_path.
+        base_url: Optional conda server URL for direct downloads
+        cache_dir: Optional directory for the on-disk repodata index
 
     Returns:
         True if successful, False otherwise
     """
+    if root_prefix is None:
+        root_prefix = env_path.parent / "root"
     packages = [f"{package}={version}"]
     if devel_package:
         packages.append(f"{devel_package}={version}")
     if verbose:
         print(f"  Downloading: {', '.join(packages)}")
+    if base_url:
+        wanted = [(package, version)] + ([(devel_package, version)] if devel_package else [])
+        # Only the runtime package's shared libraries are needed; the devel
+        # package is unpacked whole for its headers.
+        def keep(name, member):
+            return name != package or _is_shared_object(member)
+        if download_conda_direct(channel, wanted, env_path, base_url, verbose, cache_dir, keep):
+            return True
+        if verbose:
+            print("  Direct download not possible, falling back to micromamba")
+        _shutil.rmtree(env_path, ignore_errors=True)
     result = subprocess.run(
-        [_get_micromamba(), "create", "-y", "-r", str(env_path.parent / "root"),
+        [_get_micromamba(), "create", "-y", "-r", str(root_prefix),
          "-p", str(env_path), "-c", channel] + packages,
-        capture_output=True, text=True, check=False
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE if verbose else subprocess.DEVNULL,  # only shown when verbose
+        check=False
     )
     if result.returncode != 0:
         if verbose:
-            print(f"  Failed: {result.stderr[-300:]}")
+            print(f"  Failed: {result.stderr[-300:].decode(errors='replace')}")
         return False
     return True
 
 
+@functools.lru_cache(maxsize=None)
+def _prefix_matcher(prefixes: Tuple[str, ...]):
+    """Compile name prefixes into one regex; ``m.lastindex - 1`` is the prefix rank."""
+    return re.compile("|".join(f"({re.escape(p)})" for p in prefixes)).match
+
+
+def _best_library(entries, match):
+    """Pick the best-ranked library among ``entries`` (os.DirEntry objects).
+
+    Returns:
+        Tuple of (path, rank), or (None, None) when nothing matches. A false
+        ``rank[0]`` means a preferred (regular, plainly versioned) file.
+    """
+    best, best_rank = None, None
+    for entry in entries:
+        name = entry.name
+        m = match(name)
+        if m is None:
+            continue
+        prio = m.lastindex - 1
+        exact = name.endswith(".so")
+        preferred = (exact or name.count(".so") == 1) and not entry.is_symlink()
+        if preferred and prio == 0 and exact:
+            return entry.path, (False,)
+        rank = (not preferred, prio, not exact)
+        if best_rank is None or rank < best_rank:
+            best, best_rank = entry.path, rank
+    return best, best_rank
+
+
+def _iter_lib_dirs(env_path: Path):
+    """Yield the non-directory entries of env/lib and env/lib64, if present."""
+    for libdir in (env_path / "lib", env_path / "lib64"):
+        try:
+            it = os.scandir(libdir)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    yield entry
+
+
 def find_library(env_path: Path, package: str, library_name: str = None, verbose: bool = False) -> Optional[Path]:
     """Find shared library (.so) in conda environment.
 
+    Conda installs shared libraries into ``lib/`` (or ``lib64/``), so those
+    are probed first; the whole environment is walked only when they hold no
+    preferred match. Regular files named ``<prefix>.so`` or with a single
+    ``.so`` component (``libfoo.so.2.1``) are preferred; symlinks and other
+    matches are kept only as a fallback. Earlier prefixes win ties, and the
+    scan stops at the first regular ``<primary prefix>.so`` file.
+
     Args:
         env_path: Path to conda environment
         package: Package name to locate library for
@@ -247,99 +669,353 @@ def find_library(env_path: Path, package: str, library_name: str = None, verbose
     """
     if library_name:
         base = library_name.removesuffix('.so').removeprefix('lib')
-        lib_patterns = [library_name + '*', f"lib{base}.so*"]
+        prefixes = (library_name, f"lib{base}.so")
     else:
-        lib_patterns = [f'lib{package}.so*', 'libonedal.so*']
-    for pattern in lib_patterns:
-        for m in env_path.glob(f"**/{pattern}"):
-            if (m.suffix == ".so" or m.name.count(".so") == 1) and not m.is_symlink():
-                if verbose:
-                    print(f"  Found: {m}")
-                return m
-    for pattern in lib_patterns:
-        matches = list(env_path.glob(f"**/{pattern}"))
-        if matches:
-            if verbose:
-                print(f"  Found (fallback): {matches[0]}")
-            return matches[0]
-    return None
+        prefixes = (f'lib{package}.so', 'libonedal.so')
+    match = _prefix_matcher(prefixes)
+    best, best_rank = _best_library(_iter_lib_dirs(env_path), match)
+    if best is None or best_rank[0]:
+        best, best_rank = _best_library(scan_entries(env_path), match)
+    if best is None:
+        return None
+    if verbose:
+        print(f"  Found{' (fallback)' if best_rank[0] else ''}: {best}")
+    return Path(best)
+
+
+def _tmp_sibling(path: Path) -> Path:
+    """Create a unique empty temp file next to path (same filesystem, so os.replace is atomic)."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    return Path(tmp)
 
 
 def generate_abi_baseline(lib_path: Path, output_path: Path,
                           headers_dir: Optional[Path] = None,
                           suppressions: Optional[Path] = None,
-                          verbose: bool = False) -> bool:
+                          verbose: bool = False,
+                          compress: bool = False) -> bool:
     """Generate ABI baseline using abidw.
 
     Args:
         lib_path: Path to shared library
         output_path: Path to output .abi file
         headers_dir: Optional path to public headers directory
-        suppressions: Optional path to suppressions file
+        suppressions: Optional path to an existing suppressions file
         verbose: Enable verbose output
+        compress: Store the baseline compressed (see _compressed_path); abidw's
+            output is compressed as it streams out, never written plain
 
     Returns:
         True if successful, False otherwise
     """
-    cmd = ["abidw", "--out-file", str(output_path)]
+    if compress:
+        output_path = _compressed_path(output_path)
+    # abidw writes to a temp file that is renamed into place on success, so
+    # concurrent builds or an interrupted run never leave a truncated baseline
+    # that later runs would mistake for a cached one.
+    tmp_path = _tmp_sibling(output_path)
+    cmd = ["abidw"] if compress else ["abidw", "--out-file", str(tmp_path)]
+    # Every version is installed under a fresh temp dir; leaving the library
+    # path out of the corpus keeps baselines of identical libraries
+    # byte-identical, so compare_abi's digest shortcut can skip abidiff.
+    cmd.append("--no-corpus-path")
     if headers_dir and headers_dir.exists():
         cmd.extend(["--headers-dir", str(headers_dir)])
         if verbose:
             print(f"  Using headers: {headers_dir}")
-    if suppressions and suppressions.exists():
+    if suppressions:
         cmd.extend(["--suppressions", str(suppressions)])
     cmd.append(str(lib_path))
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if result.returncode != 0:
-        if verbose:
-            print(f"  abidw failed: {result.stderr[-300:]}")
+    try:
+        # stderr is only ever shown in verbose mode; otherwise it is discarded unread.
+        if compress:
+            with (tempfile.TemporaryFile() if verbose else open(os.devnull, "wb")) as err:
+                with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err) as proc, \
+                        open(tmp_path, "wb") as raw, _compress_writer(raw) as dst:
+                    _shutil.copyfileobj(proc.stdout, dst, 1 << 20)
+                returncode = proc.returncode
+                if returncode != 0 and verbose:
+                    err.seek(0)
+                    print(f"  abidw failed: {err.read()[-300:].decode(errors='replace')}")
+        else:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE if verbose else subprocess.DEVNULL,
+                                    check=False)
+            returncode = result.returncode
+            if returncode != 0 and verbose:
+                print(f"  abidw failed: {result.stderr[-300:].decode(errors='replace')}")
+        if returncode != 0:
+            return False
+        os.replace(tmp_path, output_path)
+        return True
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+# A cached baseline may be stored plain or compressed (see --compress-cache).
+_BASELINE_SUFFIXES = ("", ".zst", ".gz")
+
+
+def _find_baseline(abi_path: Path) -> Optional[Path]:
+    """Return the cached baseline for abi_path in whichever form exists, or None."""
+    for suffix in _BASELINE_SUFFIXES:
+        candidate = abi_path.with_name(abi_path.name + suffix) if suffix else abi_path
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _compressed_path(abi_path: Path) -> Path:
+    """Where the compressed form of abi_path is stored: .zst with zstandard, else .gz."""
+    return abi_path.with_name(abi_path.name + (".zst" if _zstd is not None else ".gz"))
+
+
+def _compress_writer(raw):
+    """Wrap binary file ``raw`` in a compressing writer matching _compressed_path().
+
+    gzip output is written with mtime=0 so identical baselines compress to
+    identical bytes.
+    """
+    if _zstd is not None:
+        return _zstd.ZstdCompressor(level=6).stream_writer(raw, closefd=False)
+    return _gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+
+
+def _compress_baseline(abi_path: Path) -> Path:
+    """Replace a plain .abi file by a compressed copy and return its path.
+
+    Uses zstandard when installed and gzip otherwise. ABI XML is very
+    repetitive, so this typically shrinks the cache several times over.
+    """
+    out_path = _compressed_path(abi_path)
+    tmp_path = _tmp_sibling(out_path)
+    try:
+        with open(abi_path, "rb") as src, open(tmp_path, "wb") as raw, _compress_writer(raw) as dst:
+            _shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    abi_path.unlink()
+    return out_path
+
+
+@contextlib.contextmanager
+def _plain_baseline(path: Path):
+    """Yield a path abidiff can read: path itself, or a temporary decompressed copy."""
+    if path.suffix not in (".zst", ".gz"):
+        yield path
+        return
+    if path.suffix == ".zst" and _zstd is None:
+        raise RuntimeError(f"zstandard is required to read {path}")
+    with tempfile.NamedTemporaryFile(suffix=".abi") as tmp:
+        with open(path, "rb") as raw:
+            if path.suffix == ".zst":
+                src = _zstd.ZstdDecompressor().stream_reader(raw)
+            else:
+                src = _gzip.GzipFile(fileobj=raw, mode="rb")
+            with src:
+                _shutil.copyfileobj(src, tmp, 1 << 20)
+        tmp.flush()
+        yield Path(tmp.name)
+
+
+@functools.lru_cache(maxsize=None)
+def _abidiff_supports(option: str) -> bool:
+    """Return True if the installed abidiff advertises option in --help."""
+    try:
+        result = subprocess.run(["abidiff", "--help"], capture_output=True, check=False)
+    except OSError:
         return False
-    return True
+    needle = option.encode()
+    return needle in result.stdout or needle in result.stderr
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    """blake2b digest of a file's contents.
+
+    Memoised on (path, mtime, size) so a baseline shared by two adjacent pairs
+    is only read once per run.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _content_digest(path: Path) -> str:
+    st = path.stat()
+    return _file_digest(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _tree_digest(root: Path) -> str:
+    """Digest of every file below root: relative paths plus contents."""
+    h = hashlib.blake2b(digest_size=16)
+    for rel, path in sorted((p.relative_to(root).as_posix(), p)
+                            for p in walk_files(root) if p.is_file()):
+        h.update(f"{rel}\0{_content_digest(path)}\n".encode())
+    return h.hexdigest()
+
+
+def _diff_cache_path(cache_dir: Path, old_abi: Path, new_abi: Path,
+                     suppressions: Optional[Path], mode: str) -> Path:
+    """Return the on-disk location of a cached abidiff result.
+
+    The key covers the contents of both baselines and the suppressions file plus
+    the output mode. abidiff is deterministic, so a baseline regenerated with
+    identical content (or a cache directory that moved) still hits.
+    """
+    parts = [_content_digest(old_abi), _content_digest(new_abi)]
+    if suppressions:
+        parts.append(_content_digest(suppressions))
+    parts.append(mode)
+    key = hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    return cache_dir / "diffs" / f"diff_{key}.json.gz"
+
+
+def _load_cached_diff(path: Path) -> Optional[Tuple[int, Dict, str, Optional[Dict]]]:
+    """Load a cached (exit_code, stats, stdout, symbols) tuple, or None on miss/corruption."""
+    try:
+        with _gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return data["exit_code"], data["stats"], data["stdout"], data["symbols"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _store_cached_diff(path: Path, exit_code: int, stats: Dict, stdout: str,
+                       symbols: Optional[Dict]) -> None:
+    """Persist an abidiff result; cache failures are never fatal."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"exit_code": exit_code, "stats": stats, "stdout": stdout,
+                       "symbols": symbols}, f)
+    except OSError as exc:
+        logger.debug("Could not write diff cache %s: %s", path, exc)
+
+
+def _tee_lines(lines, buf: io.StringIO):
+    """Yield ``lines`` unchanged while copying them into ``buf``."""
+    for line in lines:
+        buf.write(line)
+        yield line
+
+
+# e.g. "Function symbols changes summary: 3 Removed (1 filtered out), 2 Added ..."
+_SUMMARY_RE = re.compile(r"Function symbols changes summary: (\d+) Removed.*?(\d+) Added")
+
+
+def _summary_stats(lines) -> Dict:
+    """Public removed/added counts from abidiff's "Function symbols" summary line.
+
+    Stops reading at the first summary line; callers drain the rest.
+    """
+    stats = {"public": {"removed": 0, "added": 0}}
+    for line in lines:
+        m = _SUMMARY_RE.search(line)
+        if m:
+            stats["public"]["removed"] = int(m.group(1))
+            stats["public"]["added"] = int(m.group(2))
+            break
+    return stats
 
 
 def compare_abi(old_abi: Path, new_abi: Path, suppressions: Optional[Path] = None,
                 classifier: Optional[SymbolClassifier] = None,
-                verbose: bool = False) -> Tuple[int, Dict, str]:
+                verbose: bool = False,
+                cache_dir: Optional[Path] = None,
+                summary_only: bool = False,
+                keep_stdout: bool = True) -> Tuple[int, Dict, str, Optional[Dict]]:
     """Compare two ABI baselines using abidiff.
 
     Args:
         old_abi: Path to old baseline .abi file
         new_abi: Path to new baseline .abi file
-        suppressions: Optional path to suppressions file
+        suppressions: Optional path to an existing suppressions file
         classifier: Optional SymbolClassifier for categorizing changes
         verbose: Enable verbose output
+        cache_dir: Optional directory for caching results; reruns with
+            unchanged inputs skip both abidiff and parsing
+        summary_only: Without a classifier, only the summary counts are
+            needed; run ``abidiff --stat`` so no full report is produced
+        keep_stdout: Retain the raw report; when False it is parsed straight
+            from the pipe and "" is returned in its place
 
     Returns:
-        Tuple of (exit_code, stats_dict)
+        Tuple of (exit_code, stats_dict, abidiff_stdout, symbols). ``symbols``
+        holds the classified per-category symbol lists when a classifier is
+        given (stats are derived from them in the same pass), else None.
+    """
+    # Rebuilds and patch bumps often yield byte-identical baselines; there is
+    # nothing to diff, so answer "no change" without starting abidiff.
+    if _content_digest(old_abi) == _content_digest(new_abi):
+        if verbose:
+            print(f"  Identical baselines: {old_abi.name} == {new_abi.name}")
+        _skipped("abidiff")
+        if classifier is not None:
+            symbols = parse_abidiff((), classifier)
+            return 0, symbol_stats(symbols), "", symbols
+        return 0, _summary_stats(()), "", None
+    use_stat = classifier is None and summary_only and _abidiff_supports("--stat")
+    mode = "classified" if classifier is not None else ("stat" if use_stat else "summary")
+    if keep_stdout and mode == "summary":
+        mode = "report"  # entries stored without the raw report must not satisfy this
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = _diff_cache_path(cache_dir, old_abi, new_abi, suppressions, mode)
+        cached = _load_cached_diff(cache_path)
+        if cached is not None:
+            if verbose:
+                print(f"  Cached diff: {cache_path.name}")
+            _skipped("abidiff")
+            return cached
+    # Parse the report line by line as abidiff writes it instead of buffering
+    # it (and a splitlines() copy) in memory. stderr is only shown in verbose
+    # mode, where it goes to a temp file so a chatty stderr cannot stall the pipe.
+    symbols = None
+    buf = io.StringIO() if keep_stdout else None
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(_timed("abidiff"))
+        cmd = ["abidiff", "--stat"] if use_stat else ["abidiff"]
+        if suppressions:
+            cmd.extend(["--suppressions", str(suppressions)])
+        cmd.extend([str(stack.enter_context(_plain_baseline(old_abi))),
+                    str(stack.enter_context(_plain_baseline(new_abi)))])
+        if verbose:
+            print(f"  Running: {' '.join(cmd)}")
+        err = stack.enter_context(tempfile.TemporaryFile()) if verbose else subprocess.DEVNULL
+        proc = stack.enter_context(
+            subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, text=True))
+        lines = _tee_lines(proc.stdout, buf) if buf is not None else proc.stdout
+        if classifier:
+            symbols = parse_abidiff(lines, classifier)
+            stats = symbol_stats(symbols)
+        else:
+            stats = _summary_stats(lines)
+        for _ in lines:  # drain whatever the parser did not need
+            pass
+        returncode = proc.wait()
+        if verbose:
+            err.seek(0)
+            stderr = err.read(2000).decode(errors="replace")
+            if stderr:
+                print(f"  stderr: {stderr[:500]}")
+    stdout = buf.getvalue() if buf is not None else ""
+    # Only cache genuine verdicts; error/usage exit bits (1, 2) must be retried.
+    if cache_path is not None and returncode in (0, 4, 8, 12):
+        _store_cached_diff(cache_path, returncode, stats, stdout, symbols)
+    return returncode, stats, stdout, symbols
+
+
+def print_details(lists: Dict, old_ver: str, new_ver: str, limit: int = 10) -> None:
+    """Print detailed removed/added symbols (public, preview, internal) for a version pair.
+
+    Args:
+        lists: Per-category symbol lists as returned by parse_abidiff()
     """
-    cmd = ["abidiff"]
-    if suppressions and suppressions.exists():
-        cmd.extend(["--suppressions", str(suppressions)])
-    cmd.extend([str(old_abi), str(new_abi)])
-    if verbose:
-        print(f"  Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if verbose and result.stderr:
-        print(f"  stderr: {result.stderr[:500]}")
-    if classifier:
-        stats = parse_abidiff_symbols(result.stdout, classifier)
-    else:
-        stats = {"public": {"removed": 0, "added": 0}}
-        for line in result.stdout.splitlines():
-            if "Function symbols changes summary:" in line:
-                parts = line.replace(",", "").split()
-                try:
-                    stats["public"]["removed"] = int(parts[parts.index("Removed") - 1])
-                    stats["public"]["added"]   = int(parts[parts.index("Added")   - 1])
-                except (ValueError, IndexError):
-                    pass
-    return result.returncode, stats, result.stdout
-
-
-def print_details(stdout: str, old_ver: str, new_ver: str,
-                  classifier: SymbolClassifier, limit: int = 10) -> None:
-    """Print detailed removed/added symbols (public, preview, internal) for a version pair."""
-    lists = extract_symbol_lists(stdout, classifier)
 
     def print_grouped(items, action_name):
         grouped = defaultdict(list)
@@ -369,6 +1045,294 @@ def print_details(stdout: str, old_ver: str, new_ver: str,
             print_grouped(added, "Added")
 
 
+def _fetch_abicc_devel(ver: str, devel_fn: str, cache_dir: Path, apt_base_url: str,
+                       verbose: bool = False) -> Optional[Path]:
+    """Download and extract the devel .deb used by ABICC. Returns extract dir."""
+    _deb_path = cache_dir / f"apt_{Path(devel_fn).name}"
+    _devel_extract = cache_dir / f"apt_devel_extract_{ver}"
+    if not _deb_path.exists():
+        _url = f"{apt_base_url}/{devel_fn}"
+        if verbose:
+            print(f"  [abicc] downloading devel: {_url}")
+        try:
+            _urllib_req.urlretrieve(_url, _deb_path)
+        except Exception as _de:
+            print(f"  [abicc] devel download failed: {_de}", file=sys.stderr)
+            return None
+    if not _devel_extract.exists():
+        _devel_extract.mkdir(parents=True)
+        _extract_r = subprocess.run(["dpkg-deb", "-x", str(_deb_path), str(_devel_extract)], capture_output=True)
+        if _extract_r.returncode != 0:
+            print(f"  [abicc] dpkg-deb failed: {_extract_r.stderr.decode()[:200]}", file=sys.stderr)
+            _shutil.rmtree(_devel_extract, ignore_errors=True)
+            return None
+        return _devel_extract
+    if verbose:
+        print(f"  [abicc] devel extracted: {_devel_extract}")
+    return _devel_extract
+
+
+_INDEX_NAME = "index.json"
+
+
+def _load_index(cache_dir: Path) -> Dict[str, Dict]:
+    """Load the baseline index (baseline file name -> entry); {} if absent or unreadable.
+
+    Entries record ``status`` ("ok"/"failed") and, for built baselines, the
+    stored file name, its digest, the library digest and build-id, and the
+    abidw inputs (headers and suppressions digests, abidw version).
+    """
+    try:
+        data = _json_loads((cache_dir / _INDEX_NAME).read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_index(cache_dir: Path, index: Dict[str, Dict]) -> None:
+    """Write the baseline index atomically (temp file + os.replace)."""
+    path = cache_dir / _INDEX_NAME
+    tmp = _tmp_sibling(path)
+    try:
+        _json_dump_indented(index, tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _abidw_version() -> str:
+    """Return ``abidw --version`` output (queried once per run), "" if unavailable."""
+    try:
+        result = subprocess.run(["abidw", "--version"], capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    return result.stdout.strip()
+
+
+def build_baseline(ver: str, abi_path: Path, args: argparse.Namespace, cache_dir: Path,
+                   apt_version_map: Dict[str, str],
+                   abicc_devel_map: Optional[Dict[str, str]] = None,
+                   abicc_extract_dirs: Optional[Dict[str, Path]] = None) -> bool:
+    """Download one version and generate its ABI baseline unless already cached.
+
+    Safe to run concurrently for different versions: every version uses its own
+    temporary environment / extract directory. The outcome is recorded in
+    ``args._baseline_index`` when main() has set one.
+
+    Returns:
+        True if a baseline for abi_path exists afterwards, False otherwise
+    """
+    cached = _find_baseline(abi_path)
+    if cached is not None:
+        if args.verbose:
+            print(f"  Cached: {cached.name}")
+        return True
+    index = getattr(args, "_baseline_index", None)
+    lib_info = _generate_baseline(ver, abi_path, args, cache_dir, apt_version_map,
+                                  abicc_devel_map, abicc_extract_dirs)
+    if lib_info is None:
+        if index is not None:
+            index[abi_path.name] = {"version": ver, "status": "failed"}
+        return False
+    stored = _find_baseline(abi_path)
+    if args.compress_cache and stored == abi_path:
+        stored = _compress_baseline(abi_path)
+    if index is not None:
+        index[abi_path.name] = {
+            "version": ver,
+            "status": "ok",
+            "abi": stored.name,
+            "abi_digest": _content_digest(stored),
+            **lib_info,
+        }
+    return True
+
+
+def _elf_build_id(path: Path) -> Optional[str]:
+    """Return the GNU build-id of an ELF file as hex, or None if it has none.
+
+    Reads only the program headers and PT_NOTE segments, not the whole file.
+    """
+    try:
+        with open(path, "rb") as f:
+            ident = f.read(16)
+            if len(ident) < 16 or ident[:4] != b"\x7fELF" or ident[4] not in (1, 2):
+                return None
+            is64 = ident[4] == 2
+            end = "<" if ident[5] == 1 else ">"
+            hdr = f.read(48 if is64 else 36)
+            if is64:
+                (phoff,) = struct.unpack_from(end + "Q", hdr, 16)
+                phentsize, phnum = struct.unpack_from(end + "HH", hdr, 38)
+            else:
+                (phoff,) = struct.unpack_from(end + "I", hdr, 12)
+                phentsize, phnum = struct.unpack_from(end + "HH", hdr, 26)
+            f.seek(phoff)
+            phdrs = f.read(phentsize * phnum)
+            for i in range(phnum):
+                if is64:
+                    p_type, _, offset, _, _, size, _, align = struct.unpack_from(
+                        end + "IIQQQQQQ", phdrs, i * phentsize)
+                else:
+                    p_type, offset, _, _, size, _, _, align = struct.unpack_from(
+                        end + "IIIIIIII", phdrs, i * phentsize)
+                if p_type != 4:  # PT_NOTE
+                    continue
+                f.seek(offset)
+                notes = f.read(size)
+                pad = 8 if align == 8 else 4
+                pos = 0
+                while pos + 12 <= len(notes):
+                    namesz, descsz, n_type = struct.unpack_from(end + "III", notes, pos)
+                    name_at = pos + 12
+                    desc_at = name_at + -(-namesz // pad) * pad
+                    if n_type == 3 and notes[name_at:name_at + namesz] == b"GNU\0":  # NT_GNU_BUILD_ID
+                        return notes[desc_at:desc_at + descsz].hex()
+                    pos = desc_at + -(-descsz // pad) * pad
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+def _abidw_inputs(headers: Optional[Path], suppressions: Optional[Path]) -> Dict[str, str]:
+    """Index fields identifying the abidw inputs other than the library itself."""
+    return {
+        "headers_digest": (_tree_digest(headers) if headers and headers.exists()
+                           else "none"),
+        "suppressions_digest": _content_digest(suppressions) if suppressions else "none",
+        "abidw_version": _abidw_version(),
+    }
+
+
+def _reuse_baseline(build_id: str, ver: str, abi_path: Path,
+                    index: Optional[Dict[str, Dict]],
+                    inputs: Optional[Dict[str, str]] = None) -> bool:
+    """Link an earlier version's baseline to abi_path if its library has this build-id.
+
+    Only entries of the same package/library (same file name prefix) whose
+    recorded abidw inputs (see _abidw_inputs) equal ``inputs`` are considered;
+    a matching build-id alone says nothing about the headers or suppressions
+    the earlier baseline was filtered with.
+    """
+    if not index:
+        return False
+    prefix = abi_path.name[:-len(f"{ver}.abi")]
+    inputs = inputs or {}
+    for name, entry in list(index.items()):
+        if (entry.get("build_id") != build_id or entry.get("status") != "ok"
+                or not name.startswith(prefix)
+                or any(entry.get(k) != v for k, v in inputs.items())):
+            continue
+        src = abi_path.parent / entry.get("abi", "")
+        if not src.is_file() or _content_digest(src) != entry.get("abi_digest"):
+            continue
+        dst = abi_path.with_name(abi_path.name + src.name[len(name):])
+        tmp = _tmp_sibling(dst)
+        try:
+            tmp.unlink()
+            try:
+                os.link(src, tmp)
+            except OSError:
+                _shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return True
+    return False
+
+
+def _baseline_from_library(lib: Path, ver: str, abi_path: Path, headers: Optional[Path],
+                           args: argparse.Namespace) -> Optional[Dict[str, str]]:
+    """Produce the baseline for ``lib``: reuse one with the same build-id, else run abidw.
+
+    Returns:
+        Index fields describing the library, or None if abidw failed
+    """
+    inputs = _abidw_inputs(headers, args._suppressions)
+    info = {"lib_digest": _content_digest(lib), **inputs}
+    build_id = _elf_build_id(lib)
+    if build_id:
+        info["build_id"] = build_id
+        if _reuse_baseline(build_id, ver, abi_path, getattr(args, "_baseline_index", None),
+                           inputs):
+            if args.verbose:
+                print(f"  Reused baseline with build-id {build_id} for {ver}")
+            _skipped("abidw")
+            return info
+    with _timed("abidw"):
+        ok = generate_abi_baseline(lib, abi_path, headers, args._suppressions, args.verbose,
+                                   compress=args.compress_cache)
+    return info if ok else None
+
+
+def _generate_baseline(ver: str, abi_path: Path, args: argparse.Namespace, cache_dir: Path,
+                       apt_version_map: Dict[str, str],
+                       abicc_devel_map: Optional[Dict[str, str]],
+                       abicc_extract_dirs: Optional[Dict[str, Path]]) -> Optional[Dict[str, str]]:
+    """Download/extract one version and run abidw on it (see build_baseline).
+
+    Returns:
+        Index fields for the library the baseline was made from, or None on
+        failure
+    """
+    if args.channel == "apt":
+        filename = apt_version_map.get(ver)
+        if not filename:
+            return None
+        with _timed("download"):
+            extract_dir = download_and_extract_apt(ver, filename, cache_dir, args.apt_base_url,
+                                                   args.verbose)
+        if not extract_dir:
+            return None
+        # Also download devel package for ABICC if needed
+        if abicc_devel_map is not None and ver not in abicc_extract_dirs:
+            _devel_fn = abicc_devel_map.get(ver)
+            if _devel_fn:
+                _devel_extract = _fetch_abicc_devel(ver, _devel_fn, cache_dir, args.apt_base_url, args.verbose)
+                if _devel_extract:
+                    abicc_extract_dirs[ver] = _devel_extract
+            elif args.verbose:
+                print(f"  [abicc] no devel pkg found for version {ver}")
+        lib = find_library_apt(extract_dir, args.library_name or args.package, args.verbose)
+        if not lib:
+            if args.verbose:
+                print(f"  Library not found for {ver} (apt)")
+            return None
+        return _baseline_from_library(lib, ver, abi_path, None, args)
+    with tempfile.TemporaryDirectory(prefix="abi_env_") as tmpdir:
+        env_path = Path(tmpdir) / "env"
+        with _timed("download"):
+            ok = download_packages(args.channel, args.package, ver, env_path,
+                                   args.devel_package, args.verbose,
+                                   root_prefix=cache_dir / "mamba_root",
+                                   base_url=args.conda_base_url, cache_dir=cache_dir)
+        if not ok:
+            return None
+        lib = find_library(env_path, args.package, library_name=args.library_name, verbose=args.verbose)
+        if not lib and args.conda_base_url:
+            # A direct download skips dependencies and keeps only the package's
+            # own .so files, so a metapackage or a library shipped by a
+            # dependency is missed; let the solver build the full environment.
+            if args.verbose:
+                print(f"  Library not in the direct download of {ver}, retrying with micromamba")
+            _shutil.rmtree(env_path, ignore_errors=True)
+            with _timed("download"):
+                ok = download_packages(args.channel, args.package, ver, env_path,
+                                       args.devel_package, args.verbose,
+                                       root_prefix=cache_dir / "mamba_root")
+            if not ok:
+                return None
+            lib = find_library(env_path, args.package, library_name=args.library_name,
+                               verbose=args.verbose)
+        if not lib:
+            if args.verbose:
+                print(f"  Library not found for {ver}")
+            return None
+        headers = env_path / args.headers_subdir if args.devel_package else None
+        return _baseline_from_library(lib, ver, abi_path, headers, args)
+
+
 def _resolve_headers(devel_dir, ver, tpl):
     """Resolve headers path from template with {version}. (S3: module-level)"""
     if not tpl:
@@ -400,9 +1364,18 @@ def _resolve_headers(devel_dir, ver, tpl):
     return fallback
 
 
+# abidiff exit code -> verdict name, and the labels used in the per-pair lines.
+_ABIDIFF_STATUS = {0: "NO_CHANGE", 4: "COMPATIBLE", 8: "INCOMPATIBLE", 12: "BREAKING"}
+_STATUS_LABELS = {0: "✅ NO_CHANGE", 4: "✅ COMPATIBLE", 8: "⚠️  INCOMPAT", 12: "❌ BREAKING"}
+_COMBINED_LABELS = {"NO_CHANGE": "✅ NO_CHANGE", "COMPATIBLE": "✅ COMPATIBLE",
+                    "INCOMPATIBLE": "⚠️ INCOMPAT", "BREAKING": "🔴 BREAKING",
+                    "SOURCE_BREAK": "🟠 SOURCE_BREAK", "BINARY_BREAK": "🔴 BINARY_BREAK",
+                    "ELF_INTERNAL": "⚠️ ELF_INTERNAL"}
+
+
 def _combined_status(abidiff_ec, abicc_r, old_ver=None, new_ver=None):
     """Combine abidiff and ABICC verdicts into a single status. (S3: module-level)"""
-    abidiff_status = {0: "NO_CHANGE", 4: "COMPATIBLE", 8: "INCOMPATIBLE", 12: "BREAKING"}.get(abidiff_ec, "UNKNOWN")
+    abidiff_status = _ABIDIFF_STATUS.get(abidiff_ec, "UNKNOWN")
     if abicc_r is None or abicc_r.error:
         return abidiff_status
     has_source_break = abicc_r.source_compat < 100.0 or abicc_r.source_problems > 0
@@ -443,6 +1416,9 @@ def main():
     parser.add_argument("--filter-version", help="Regex to filter version list (e.g. ^2021, ^2025)")
     parser.add_argument("--apt-pkg-pattern", help="Regex for APT package names when channel=apt")
     parser.add_argument("--apt-base-url", default=INTEL_APT_BASE, help="APT base URL")
+    parser.add_argument("--conda-base-url", default=CONDA_BASE_URL,
+                        help="Conda server for direct package downloads; "
+                             "empty string always provisions with micromamba")
     parser.add_argument("--apt-packages-url", default=None,
                         help="Override APT Packages index URL (supports .gz and .xz)")
     parser.add_argument("--config", help="Path to package YAML config (alternative to positional args)")
@@ -450,6 +1426,22 @@ def main():
     parser.add_argument("--abicc", action="store_true", help="Also run abi-compliance-checker for type-level analysis")
     parser.add_argument("--abicc-timeout", type=int, default=None,
                         help="Override ABICC timeout in seconds (default from config or 300)")
+    parser.add_argument("--from-cache", action="store_true",
+                        help="Compare only versions whose baselines are already in --cache-dir; "
+                             "skips the version query and all downloads")
+    parser.add_argument("--compress-cache", action="store_true",
+                        help="Store new ABI baselines compressed (.abi.zst with zstandard, "
+                             "else .abi.gz) straight from abidw's output; they are "
+                             "decompressed to a temp file for abidiff")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Baselines to build, and version pairs to abidiff, "
+                             "concurrently (default: number of CPUs)")
+    parser.add_argument("--versions-ttl", type=float, default=3600,
+                        help="Seconds to reuse the cached channel version list "
+                             "(default: 3600; 0 always queries the channel)")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Retry versions recorded as failed in the cache index "
+                             "(by default they are skipped without downloading)")
 
     args = parser.parse_args()
     if not args.config and not args.channel:
@@ -486,10 +1478,20 @@ def main():
         args._cfg_version_key = ""
     cache_dir = Path(args.cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
+    # Resolve and stat the suppressions file once instead of on every abidw/abidiff call
+    args._suppressions = Path(args.suppressions).resolve() if args.suppressions else None
+    if args._suppressions and not args._suppressions.exists():
+        print(f"Suppressions file not found, ignoring: {args._suppressions}", file=sys.stderr)
+        args._suppressions = None
     classifier = SymbolClassifier() if args.track_preview or args.details or args.json else None
-    print(f"Fetching versions for {args.channel}:{args.package}...")
+    _lib_tag = args.library_name.replace("/", "_").replace(".", "_") if args.library_name else "all"
     apt_version_map = {}
-    if args.channel == "apt":
+    if args.from_cache:
+        # Re-render from existing baselines only: no channel query, no downloads.
+        print(f"Using cached baselines for {args.channel}:{args.package} in {cache_dir}...")
+        versions = get_cached_versions(cache_dir, args.package, _lib_tag)
+    elif args.channel == "apt":
+        print(f"Fetching versions for {args.channel}:{args.package}...")
         if not args.library_name:
             parser.error('--library-name is required for channel=apt (e.g. libsycl.so or libccl.so)')
         if args.apt_packages_url:
@@ -502,7 +1504,11 @@ def main():
         versions = [v for v,_ in apt_rows]
         apt_version_map = {v:f for v,f in apt_rows}
     else:
-        versions = get_package_versions(args.channel, args.package)
+        print(f"Fetching versions for {args.channel}:{args.package}...")
+        versions = get_package_versions(args.channel, args.package,
+                                        root_prefix=cache_dir / "mamba_root",
+                                        cache_dir=cache_dir, ttl=args.versions_ttl,
+                                        base_url=args.conda_base_url)
     if args.filter_version:
         try:
             version_re = re.compile(args.filter_version)
@@ -525,6 +1531,7 @@ def main():
 
     results = []
     abicc_extract_dirs = {}  # version -> extract_dir (for --abicc devel pkg)
+    _abicc_devel_map = None  # version -> devel .deb filename, when ABICC needs headers
 
     # Pre-populate abicc_extract_dirs from already-extracted devel dirs
     if args.abicc:
@@ -547,187 +1554,175 @@ def main():
             _abicc_skip_headers = abicc_cfg.get("skip_headers", [])
             print(f"  [abicc] enabled, devel_pattern={_abicc_devel_pattern}")
             # S1: pre-build devel map once (avoid fetching APT index on every loop iteration)
-            _abicc_devel_map = {}
             if _abicc_devel_pattern:
                 _apt_idx_url = args.apt_packages_url or (args.apt_base_url.rstrip("/") + "/dists/all/main/binary-amd64/Packages.gz")
                 _abicc_devel_rows = get_apt_package_versions(_abicc_devel_pattern, _apt_idx_url)
                 _abicc_devel_map = {v: fn for v, fn in _abicc_devel_rows}
 
-    for i in range(len(versions) - 1):
-        old_ver, new_ver = versions[i], versions[i+1]
-        if args.verbose:
-            print(f"\nProcessing {old_ver} → {new_ver}")
-
-        _lib_tag = args.library_name.replace("/", "_").replace(".", "_") if args.library_name else "all"
-        old_abi = cache_dir / f"{args.package}_{_lib_tag}_{old_ver}.abi"
-        new_abi = cache_dir / f"{args.package}_{_lib_tag}_{new_ver}.abi"
-
-        for ver, abi_path in [(old_ver, old_abi), (new_ver, new_abi)]:
-            if abi_path.exists():
+    abi_paths = {ver: cache_dir / f"{args.package}_{_lib_tag}_{ver}.abi" for ver in versions}
+
+    # Missing baselines are built on background threads, submitted in version
+    # order, so downloads/abidw run side by side and overlap with abidiff of the
+    # earlier pairs. Threads suffice: the heavy lifting happens in subprocesses.
+    # The index remembers versions that failed before (skipped unless
+    # --retry-failed) and the digest of each built baseline, so a corrupted or
+    # replaced cache file is rebuilt rather than diffed.
+    args._baseline_index = _load_index(cache_dir)
+    _missing = []
+    for ver in versions:
+        stored = _find_baseline(abi_paths[ver])
+        entry = args._baseline_index.get(abi_paths[ver].name) or {}
+        if stored is None:
+            if entry.get("status") == "failed" and not args.retry_failed:
                 if args.verbose:
-                    print(f"  Cached: {abi_path.name}")
+                    print(f"  Skipping {ver}: failed in an earlier run (use --retry-failed)")
                 continue
-            if args.channel == "apt":
-                filename = apt_version_map.get(ver)
-                if not filename:
-                    continue
-                extract_dir = download_and_extract_apt(ver, filename, cache_dir, args.apt_base_url, args.verbose)
-                if not extract_dir:
-                    continue
-                # Also download devel package for ABICC if needed
-                if args.abicc and _abicc_devel_pattern and ver not in abicc_extract_dirs:
-                    _devel_fn = _abicc_devel_map.get(ver)
-                    if _devel_fn:
-                        # Use devel-specific extract dir (separate from runtime)
-                        _deb_name = Path(_devel_fn).name
-                        _deb_path = cache_dir / f"apt_{_deb_name}"
-                        _devel_extract = cache_dir / f"apt_devel_extract_{ver}"
-                        if not _deb_path.exists():
-                            _url = f"{args.apt_base_url}/{_devel_fn}"
-                            if args.verbose:
-                                print(f"  [abicc] downloading devel: {_url}")
-                            try:
-                                _urllib_req.urlretrieve(_url, _deb_path)
-                            except Exception as _de:
-                                print(f"  [abicc] devel download failed: {_de}", file=sys.stderr)
-                                _deb_path = None
-                        if _deb_path and _deb_path.exists():
-                            if not _devel_extract.exists():
-                                _devel_extract.mkdir(parents=True)
-                                _extract_r = subprocess.run(["dpkg-deb", "-x", str(_deb_path), str(_devel_extract)], capture_output=True)
-                                if _extract_r.returncode != 0:
-                                    print(f"  [abicc] dpkg-deb failed: {_extract_r.stderr.decode()[:200]}", file=sys.stderr)
-                                    import shutil as _sh; _sh.rmtree(_devel_extract, ignore_errors=True)
-                                else:
-                                    abicc_extract_dirs[ver] = _devel_extract
-                            elif _devel_extract.exists():
-                                abicc_extract_dirs[ver] = _devel_extract
-                                if args.verbose:
-                                    print(f"  [abicc] devel extracted: {_devel_extract}")
+            _missing.append(ver)
+        elif (entry.get("abi") == stored.name and not args.from_cache
+              and entry.get("abi_digest") not in (None, _content_digest(stored))):
+            print(f"  Cached baseline changed since it was built, regenerating: {stored.name}")
+            stored.unlink()
+            _missing.append(ver)
+        elif args.verbose:
+            print(f"  Cached: {stored.name}")
+    _workers = max(1, args.jobs or os.cpu_count() or 1)
+    _build_pool = ThreadPoolExecutor(max_workers=_workers)
+    _builds = {
+        ver: _build_pool.submit(build_baseline, ver, abi_paths[ver], args, cache_dir,
+                                apt_version_map, _abicc_devel_map, abicc_extract_dirs)
+        for ver in _missing
+    }
+
+    def _diff_pair(old_ver, new_ver):
+        """Wait for both baselines, then abidiff them; None if either is missing."""
+        for _ver in (old_ver, new_ver):
+            if _ver in _builds:
+                _builds[_ver].result()
+        old_abi, new_abi = _find_baseline(abi_paths[old_ver]), _find_baseline(abi_paths[new_ver])
+        if old_abi is None or new_abi is None:
+            return None
+        exit_code, stats, diff_stdout, symbols = compare_abi(
+            old_abi, new_abi, args._suppressions,
+            classifier if (args.track_preview or args.json) else None,
+            args.verbose, cache_dir,
+            summary_only=not args.details,
+            keep_stdout=args.details and not args.track_preview and not args.json)
+        # Classify breaking reports right away and let the raw text go: only the
+        # (much smaller) symbol lists are needed for --details.
+        if symbols is None and diff_stdout and exit_code == 12:
+            symbols = extract_symbol_lists(diff_stdout, classifier)
+        return exit_code, stats, symbols
+
+    # Pairs are diffed concurrently on their own pool (a diff blocks on builds,
+    # so sharing the build pool could starve it); results are consumed in order
+    # below, so the report reads exactly as a serial run would.
+    _diff_pool = ThreadPoolExecutor(max_workers=min(_workers, max(1, len(versions) - 1)))
+    _diffs = [_diff_pool.submit(_diff_pair, versions[i], versions[i+1])
+              for i in range(len(versions) - 1)]
+    try:
+        for i in range(len(versions) - 1):
+            old_ver, new_ver = versions[i], versions[i+1]
+            if args.verbose:
+                print(f"\nProcessing {old_ver} → {new_ver}")
+
+            old_abi, new_abi = abi_paths[old_ver], abi_paths[new_ver]
+            diff = _diffs[i].result()
+            if diff is None:
+                print(f"?(3) | {old_ver} → {new_ver} | baselines missing")
+                results.append({"old": old_ver, "new": new_ver, "exit_code": 3,
+                                 "stats": {"public": {"removed": 0, "added": 0}},
+                                 "old_abi": str(old_abi), "new_abi": str(new_abi)})
+                continue
+            exit_code, stats, symbols = diff
+
+            # Run ABICC if requested
+            abicc_result = None
+            if args.abicc:
+                _old_devel = abicc_extract_dirs.get(old_ver)
+                _new_devel = abicc_extract_dirs.get(new_ver)
+                if _old_devel and _new_devel:
+                    # Libs always come from runtime extract dirs
+                    _rt_old = cache_dir / f"apt_extract_{old_ver}"
+                    _rt_new = cache_dir / f"apt_extract_{new_ver}"
+                    _old_lib = find_library_apt(_rt_old, args.library_name or args.package, args.verbose) if _rt_old.exists() else None
+                    _new_lib = find_library_apt(_rt_new, args.library_name or args.package, args.verbose) if _rt_new.exists() else None
+                    _old_headers = _resolve_headers(_old_devel, old_ver, _abicc_headers_subpath_tpl)
+                    _new_headers = _resolve_headers(_new_devel, new_ver, _abicc_headers_subpath_tpl)
+                    if _old_lib and _new_lib:
+                        _abicc_work = cache_dir / "abicc_work"
+                        try:
+                            abicc_result = _abicc_backend.run(
+                                old_version=old_ver, old_lib_path=_old_lib, old_headers_path=_old_headers,
+                                new_version=new_ver, new_lib_path=_new_lib, new_headers_path=_new_headers,
+                                library_name=args.library_name or args.package,
+                                skip_headers=_abicc_skip_headers,
+                                work_dir=_abicc_work,
+                                timeout=_abicc_timeout,
+                            )
+                            if abicc_result.error:
+                                print(f"  [abicc] warning: {abicc_result.error}", file=sys.stderr)
+                        except Exception as _abicc_exc:
+                            print(f"  [abicc] exception: {_abicc_exc}", file=sys.stderr)
                     else:
-                        if args.verbose:
-                            print(f"  [abicc] no devel pkg found for version {ver}")
-                lib = find_library_apt(extract_dir, args.library_name or args.package, args.verbose)
-                if not lib:
-                    if args.verbose:
-                        print(f"  Library not found for {ver} (apt)")
-                    continue
-                sup = Path(args.suppressions) if args.suppressions else None
-                if not generate_abi_baseline(lib, abi_path, None, sup, args.verbose):
-                    continue
-            else:
-                with tempfile.TemporaryDirectory(prefix="abi_env_") as tmpdir:
-                    env_path = Path(tmpdir) / "env"
-                    if not download_packages(args.channel, args.package, ver, env_path,
-                                             args.devel_package, args.verbose):
-                        continue
-                    lib = find_library(env_path, args.package, library_name=args.library_name, verbose=args.verbose)
-                    if not lib:
-                        if args.verbose:
-                            print(f"  Library not found for {ver}")
-                        continue
-                    headers = env_path / args.headers_subdir if args.devel_package else None
-                    sup = Path(args.suppressions) if args.suppressions else None
-                    if not generate_abi_baseline(lib, abi_path, headers, sup, args.verbose):
-                        continue
-
-        if not old_abi.exists() or not new_abi.exists():
-            print(f"?(3) | {old_ver} → {new_ver} | baselines missing")
-            results.append({"old": old_ver, "new": new_ver, "exit_code": 3,
-                             "stats": {"public": {"removed": 0, "added": 0}},
-                             "old_abi": str(old_abi), "new_abi": str(new_abi)})
-            continue
-
-        sup = Path(args.suppressions) if args.suppressions else None
-        exit_code, stats, diff_stdout = compare_abi(old_abi, new_abi, sup,
-                                       classifier if (args.track_preview or args.json) else None,
-                                       args.verbose)
-
-        # Run ABICC if requested
-        abicc_result = None
-        if args.abicc:
-            _old_devel = abicc_extract_dirs.get(old_ver)
-            _new_devel = abicc_extract_dirs.get(new_ver)
-            if _old_devel and _new_devel:
-                # Libs always come from runtime extract dirs
-                _rt_old = cache_dir / f"apt_extract_{old_ver}"
-                _rt_new = cache_dir / f"apt_extract_{new_ver}"
-                _old_lib = find_library_apt(_rt_old, args.library_name or args.package, args.verbose) if _rt_old.exists() else None
-                _new_lib = find_library_apt(_rt_new, args.library_name or args.package, args.verbose) if _rt_new.exists() else None
-                _old_headers = _resolve_headers(_old_devel, old_ver, _abicc_headers_subpath_tpl)
-                _new_headers = _resolve_headers(_new_devel, new_ver, _abicc_headers_subpath_tpl)
-                if _old_lib and _new_lib:
-                    _abicc_work = cache_dir / "abicc_work"
-                    try:
-                        abicc_result = _abicc_backend.run(
-                            old_version=old_ver, old_lib_path=_old_lib, old_headers_path=_old_headers,
-                            new_version=new_ver, new_lib_path=_new_lib, new_headers_path=_new_headers,
-                            library_name=args.library_name or args.package,
-                            skip_headers=_abicc_skip_headers,
-                            work_dir=_abicc_work,
-                            timeout=_abicc_timeout,
-                        )
-                        if abicc_result.error:
-                            print(f"  [abicc] warning: {abicc_result.error}", file=sys.stderr)
-                    except Exception as _abicc_exc:
-                        print(f"  [abicc] exception: {_abicc_exc}", file=sys.stderr)
+                        print(f"  [abicc] libs not found for {old_ver}/{new_ver} — skipping ABICC", file=sys.stderr)
                 else:
-                    print(f"  [abicc] libs not found for {old_ver}/{new_ver} — skipping ABICC", file=sys.stderr)
-            else:
-                if args.verbose:
-                    print(f"  [abicc] devel dirs missing for {old_ver}/{new_ver} — skipping")
-
-        status = {0:"✅ NO_CHANGE", 4:"✅ COMPATIBLE", 8:"⚠️  INCOMPAT", 12:"❌ BREAKING"}.get(exit_code, f"?({exit_code})")
-        if args.abicc and abicc_result and abicc_result.error:
-            status = status + " [ABICC:⚠️skipped]"
-        elif args.abicc and not abicc_result:
-            status = status + " [ABICC:⚠️skipped]"
-        if args.abicc and abicc_result and not abicc_result.error:
-            combined = _combined_status(exit_code, abicc_result, old_ver, new_ver)
-            status_emoji = {"NO_CHANGE": "✅ NO_CHANGE", "COMPATIBLE": "✅ COMPATIBLE",
-                            "INCOMPATIBLE": "⚠️ INCOMPAT", "BREAKING": "🔴 BREAKING",
-                            "SOURCE_BREAK": "🟠 SOURCE_BREAK", "BINARY_BREAK": "🔴 BINARY_BREAK", "ELF_INTERNAL": "⚠️ ELF_INTERNAL"}.get(combined, combined)
-            status = status_emoji + f" [Bin:{abicc_result.binary_compat:.1f}% Src:{abicc_result.source_compat:.1f}%]"
-        pub = stats.get("public", {"removed": 0, "added": 0})
-        line = f"{status} | {old_ver} → {new_ver} | public: -{pub['removed']} +{pub['added']}"
-        if args.abicc and abicc_result and not abicc_result.error:
-            _dbg_old = "yes" if abicc_result.debug_info_old else "no"
-            _dbg_new = "yes" if abicc_result.debug_info_new else "no"
-            line += f" [ABICC:{abicc_result.mode} dbg:{_dbg_old}/{_dbg_new}]"
-        if args.track_preview:
-            prv = stats.get("preview",  {"removed": 0, "added": 0})
-            itn = stats.get("internal", {"removed": 0, "added": 0})
-            line += f" | preview: -{prv['removed']} +{prv['added']} | internal: -{itn['removed']} +{itn['added']}"
-        print(line)
-        _res = {"old": old_ver, "new": new_ver, "exit_code": exit_code,
-                "stats": stats, "old_abi": str(old_abi), "new_abi": str(new_abi), "stdout": diff_stdout}
-        if abicc_result and not abicc_result.error:
-            _res["abicc"] = {
-                "mode": abicc_result.mode,
-                "debug_info_old": abicc_result.debug_info_old,
-                "debug_info_new": abicc_result.debug_info_new,
-                "dump_mode_attempted": abicc_result.dump_mode_attempted,
-                "binary_compat": abicc_result.binary_compat,
-                "source_compat": abicc_result.source_compat,
-                "binary_problems": abicc_result.binary_problems,
-                "source_problems": abicc_result.source_problems,
-                "added_symbols": abicc_result.added_symbols,
-                "removed_symbols": abicc_result.removed_symbols,
-                "removed_symbol_names": abicc_result.removed_symbol_names[:50],
-                "type_changes": abicc_result.type_changes[:30],
-            }
-        results.append(_res)
+                    if args.verbose:
+                        print(f"  [abicc] devel dirs missing for {old_ver}/{new_ver} — skipping")
+
+            status = _STATUS_LABELS.get(exit_code, f"?({exit_code})")
+            if args.abicc and abicc_result and abicc_result.error:
+                status = status + " [ABICC:⚠️skipped]"
+            elif args.abicc and not abicc_result:
+                status = status + " [ABICC:⚠️skipped]"
+            if args.abicc and abicc_result and not abicc_result.error:
+                combined = _combined_status(exit_code, abicc_result, old_ver, new_ver)
+                status_emoji = _COMBINED_LABELS.get(combined, combined)
+                status = status_emoji + f" [Bin:{abicc_result.binary_compat:.1f}% Src:{abicc_result.source_compat:.1f}%]"
+            pub = stats.get("public", {"removed": 0, "added": 0})
+            line = f"{status} | {old_ver} → {new_ver} | public: -{pub['removed']} +{pub['added']}"
+            if args.abicc and abicc_result and not abicc_result.error:
+                _dbg_old = "yes" if abicc_result.debug_info_old else "no"
+                _dbg_new = "yes" if abicc_result.debug_info_new else "no"
+                line += f" [ABICC:{abicc_result.mode} dbg:{_dbg_old}/{_dbg_new}]"
+            if args.track_preview:
+                prv = stats.get("preview",  {"removed": 0, "added": 0})
+                itn = stats.get("internal", {"removed": 0, "added": 0})
+                line += f" | preview: -{prv['removed']} +{prv['added']} | internal: -{itn['removed']} +{itn['added']}"
+            print(line)
+            _res = {"old": old_ver, "new": new_ver, "exit_code": exit_code,
+                    "stats": stats, "old_abi": str(old_abi), "new_abi": str(new_abi),
+                    "symbols": symbols}
+            if abicc_result and not abicc_result.error:
+                _res["abicc"] = {
+                    "mode": abicc_result.mode,
+                    "debug_info_old": abicc_result.debug_info_old,
+                    "debug_info_new": abicc_result.debug_info_new,
+                    "dump_mode_attempted": abicc_result.dump_mode_attempted,
+                    "binary_compat": abicc_result.binary_compat,
+                    "source_compat": abicc_result.source_compat,
+                    "binary_problems": abicc_result.binary_problems,
+                    "source_problems": abicc_result.source_problems,
+                    "added_symbols": abicc_result.added_symbols,
+                    "removed_symbols": abicc_result.removed_symbols,
+                    "removed_symbol_names": abicc_result.removed_symbol_names[:50],
+                    "type_changes": abicc_result.type_changes[:30],
+                }
+            results.append(_res)
+    finally:
+        _diff_pool.shutdown(wait=False, cancel_futures=True)
+        _build_pool.shutdown(wait=False, cancel_futures=True)
+    if _builds:
+        _save_index(cache_dir, args._baseline_index)
 
     # Summary
     print()
     print("=" * 60)
     print("SUMMARY")
     print("=" * 60)
+    counts = Counter(r["exit_code"] for r in results)
     breaking = [r for r in results if r["exit_code"] == 12]
-    compat   = [r for r in results if r["exit_code"] == 4]
-    no_change= [r for r in results if r["exit_code"] == 0]
-    print(f"✅ NO_CHANGE:  {len(no_change)}")
-    print(f"✅ COMPATIBLE: {len(compat)}")
+    print(f"✅ NO_CHANGE:  {counts[0]}")
+    print(f"✅ COMPATIBLE: {counts[4]}")
     print(f"❌ BREAKING:   {len(breaking)}")
     if breaking:
         print("\nBreaking changes (public API):")
@@ -742,8 +1737,8 @@ def main():
         print(f"DETAILS (top {args.details_limit} symbols per category per namespace)")
         print("=" * 60)
         for r in breaking:
-            print_details(r["stdout"], r["old"], r["new"],
-                          classifier, args.details_limit)
+            if r.get("symbols"):
+                print_details(r["symbols"], r["old"], r["new"], args.details_limit)
 
     # JSON Output
     if args.json:
@@ -755,7 +1750,7 @@ def main():
             "comparisons": []
         }
         for r in results:
-            _base_status = {0: "NO_CHANGE", 4: "COMPATIBLE", 8: "INCOMPATIBLE", 12: "BREAKING"}.get(r["exit_code"], f"UNKNOWN({r['exit_code']})")
+            _base_status = _ABIDIFF_STATUS.get(r["exit_code"], f"UNKNOWN({r['exit_code']})")
             _ar = r.get("abicc")
             if _ar:
                 _has_source_break = _ar["source_compat"] < 100.0 or _ar["source_problems"] > 0
@@ -778,8 +1773,8 @@ def main():
             }
             if _ar:
                 comp["abicc"] = _ar
-            if r.get("stdout") and r["exit_code"] in (4, 8, 12):
-                lists = extract_symbol_lists(r["stdout"], classifier)
+            lists = r.get("symbols")
+            if lists and r["exit_code"] in (4, 8, 12):
                 comp["symbols"] = {}
                 for cat in ("public", "preview", "internal"):
                     comp["symbols"][cat] = {
@@ -788,10 +1783,16 @@ def main():
                     }
             json_data["comparisons"].append(comp)
 
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, indent=2)
+        _json_dump_indented(json_data, json_path)
         print(f"\nSaved results to {json_path}")
 
+    if args.verbose:
+        print()
+        _print_phase_times()
+    if args.verbose and classifier is not None:
+        print(f"\nclassify cache: {classify_symbol.cache_info()}")
+        print(f"demangle cache: {demangle_symbol.cache_info()}")
+
 
 if __name__ == "__main__":
     import sys
@@ -2,17 +2,44 @@
 # abi_tracker/scripts/package_manager.py
 # Universal package downloader supporting APT, conda, PyPI
 
+import base64
+import copy
+import fnmatch
+import http.client
+import os
+import shutil
 import sys
+import time
 import yaml
 import subprocess
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from abi_scanner.sources.utils import scan_tree
+
+# libyaml's C loader when PyYAML was built with it; same safe subset, much faster
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=16)
+def _load_config(path, mtime_ns):
+    """Parse a YAML config once per (path, mtime); callers must not mutate the result."""
+    with open(path) as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
 
 class PackageManager:
     def __init__(self, config_file):
-        with open(config_file) as f:
-            self.config = yaml.safe_load(f)
+        path = os.path.abspath(config_file)
+        # Each instance gets its own copy so the cached parse stays pristine
+        self.config = copy.deepcopy(_load_config(path, os.stat(path).st_mtime_ns))
         
         self.library = self.config['library']
+        # (scheme, host) -> open HTTP(S) connection, reused across downloads
+        self._connections = {}
     
     def get_source_config(self, source):
         """Get configuration for a specific source"""
@@ -62,10 +89,90 @@ class PackageManager:
             return str(output_file)
         
         print(f"Downloading {url}...", file=sys.stderr)
-        subprocess.run(['wget', '-q', url, '-O', str(output_file)], check=True)
+        self._http_download(url, output_file)
         
         return str(output_file)
     
+    def _connection(self, parts):
+        """Return (cache key, connection, request target, headers) for a split URL
+
+        Honours http_proxy/https_proxy/no_proxy like wget did: https is
+        tunnelled through the proxy with CONNECT, plain http is sent to the
+        proxy as an absolute-URI request. Connections are kept per host.
+        """
+        proxy = getproxies().get(parts.scheme)
+        if proxy and proxy_bypass(parts.hostname or ''):
+            proxy = None
+        key = (parts.scheme, parts.netloc, proxy)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        headers = {}
+        conn = self._connections.get(key)
+        if proxy:
+            proxy_parts = urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+            if proxy_parts.username:
+                creds = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+                headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(creds.encode()).decode()
+            proxy_host = proxy_parts.hostname
+            proxy_port = proxy_parts.port
+            if parts.scheme == 'https':
+                if conn is None:
+                    conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=60)
+                    conn.set_tunnel(parts.hostname, parts.port, headers=headers)
+                headers = {}
+            else:
+                if conn is None:
+                    conn = http.client.HTTPConnection(proxy_host, proxy_port, timeout=60)
+                target = parts.geturl()
+        elif conn is None:
+            conn_cls = (http.client.HTTPSConnection if parts.scheme == 'https'
+                        else http.client.HTTPConnection)
+            conn = conn_cls(parts.netloc, timeout=60)
+        self._connections[key] = conn
+        return key, conn, target, headers
+
+    def _http_download(self, url, output_file, retries=3, backoff=0.5, max_redirects=5):
+        """Stream url into output_file over a kept-alive connection to its host
+
+        Connection errors and 5xx responses are retried with exponential
+        backoff; redirects are followed. The file only appears once complete.
+        """
+        output_file = Path(output_file)
+        part = output_file.with_name(output_file.name + '.part')
+        attempt = redirects = 0
+        while True:
+            key, conn, target, headers = self._connection(urlsplit(url))
+            try:
+                conn.request('GET', target, headers=headers)
+                resp = conn.getresponse()
+                if resp.status in (301, 302, 303, 307, 308) and redirects < max_redirects:
+                    resp.read()
+                    location = resp.getheader('Location')
+                    if not location:
+                        raise RuntimeError(f"HTTP {resp.status} redirect without Location for {url}")
+                    url = urljoin(url, location)
+                    redirects += 1
+                    continue
+                if resp.status >= 500:
+                    resp.read()
+                    raise http.client.HTTPException(f"HTTP {resp.status} for {url}")
+                if resp.status != 200:
+                    resp.read()
+                    raise RuntimeError(f"HTTP {resp.status} for {url}")
+                with open(part, 'wb') as f:
+                    shutil.copyfileobj(resp, f, 1 << 20)
+                os.replace(part, output_file)
+                return
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                del self._connections[key]
+                if attempt >= retries:
+                    part.unlink(missing_ok=True)
+                    raise
+                time.sleep(backoff * 2 ** attempt)
+                attempt += 1
+    
     def _download_conda(self, config, version, pkg_type, output_dir):
         """Download from conda channel"""
         # Use conda/mamba to download
@@ -103,16 +210,20 @@ class PackageManager:
             # unzip for .whl
             subprocess.run(['unzip', '-q', package_file, '-d', extract_dir], check=True)
     
+    def find_files(self, extract_dir):
+        """Find (libraries, headers) in extracted package with a single walk"""
+        headers, libs = scan_tree(extract_dir)
+        pattern = f"lib{self.library}*.so*"
+        return ([p for p in libs if fnmatch.fnmatchcase(p.name, pattern)],
+                [h for h in headers if '/include/' in str(h)])
+    
     def find_libraries(self, extract_dir):
         """Find .so files in extracted package"""
-        return list(Path(extract_dir).glob(f"**/lib{self.library}*.so*"))
+        return self.find_files(extract_dir)[0]
     
     def find_headers(self, extract_dir):
         """Find header files in extracted package"""
-        headers = []
-        for ext in ['*.h', '*.hpp', '*.hxx']:
-            headers.extend(Path(extract_dir).glob(f"**/{ext}"))
-        return [h for h in headers if '/include/' in str(h)]
+        return self.find_files(extract_dir)[1]
 
 def main():
     if len(sys.argv) < 4:
@@ -5,57 +5,51 @@
 import sys
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from abi_scanner.sources.utils import scan_tree
+
+# Match: namespace foo { or namespace foo::bar {
+_NS_RE = re.compile(r'^\s*namespace\s+([\w:]+)\s*\{', re.MULTILINE)
+# Match: class ClassName or struct ClassName
+_CLASS_RE = re.compile(r'^\s*(?:class|struct)\s+(\w+)(?:\s+final)?(?:\s*:\s*public)?', re.MULTILINE)
+# A private keyword as an inner, leading or trailing namespace component
+# (a bare "detail" namespace on its own is not treated as private)
+_PRIVATE_KEYWORDS = r'(?:detail|internal|backend|impl|_internal)'
+_PRIVATE_NS_RE = re.compile(
+    rf'::{_PRIVATE_KEYWORDS}::|^{_PRIVATE_KEYWORDS}::|::{_PRIVATE_KEYWORDS}$')
+_PRIVATE_PATH_RE = re.compile(r'/(?:detail|internal|backend)/')
+# Below this many headers a process pool costs more to start than it saves
+_PARALLEL_MIN_HEADERS = 256
+
 def find_headers(extract_dir):
     """Find all C/C++ header files"""
-    patterns = ['**/*.h', '**/*.hpp', '**/*.hxx']
-    headers = []
-    for pattern in patterns:
-        headers.extend(Path(extract_dir).glob(pattern))
+    headers, _ = scan_tree(extract_dir)
     
     # Filter to only include/ directories
     return [h for h in headers if '/include/' in str(h)]
 
-def parse_namespace_declarations(header_file):
-    """Extract namespace declarations from a header"""
-    namespaces = []
-    
+def _parse_header(header_file):
+    """Read a header once and extract (namespaces, classes) from it"""
     with open(header_file, 'r', encoding='utf-8', errors='ignore') as f:
         content = f.read()
     
-    # Match: namespace foo { or namespace foo::bar {
-    pattern = r'^\s*namespace\s+([\w:]+)\s*\{'
-    for match in re.finditer(pattern, content, re.MULTILINE):
-        ns = match.group(1)
-        namespaces.append(ns)
-    
-    return namespaces
+    return ([match.group(1) for match in _NS_RE.finditer(content)],
+            [match.group(1) for match in _CLASS_RE.finditer(content)])
+
+def parse_namespace_declarations(header_file):
+    """Extract namespace declarations from a header"""
+    return _parse_header(header_file)[0]
 
 def parse_class_declarations(header_file):
     """Extract class declarations from a header"""
-    classes = []
-    
-    with open(header_file, 'r', encoding='utf-8', errors='ignore') as f:
-        content = f.read()
-    
-    # Match: class ClassName or struct ClassName
-    pattern = r'^\s*(?:class|struct)\s+(\w+)(?:\s+final)?(?:\s*:\s*public)?'
-    for match in re.finditer(pattern, content, re.MULTILINE):
-        cls = match.group(1)
-        classes.append(cls)
-    
-    return classes
+    return _parse_header(header_file)[1]
 
 def is_private_namespace(namespace):
     """Determine if a namespace is private/internal"""
-    private_keywords = ['detail', 'internal', 'backend', 'impl', '_internal']
-    
-    for keyword in private_keywords:
-        if f'::{keyword}::' in namespace or namespace.startswith(f'{keyword}::') or namespace.endswith(f'::{keyword}'):
-            return True
-    
-    return False
+    return _PRIVATE_NS_RE.search(namespace) is not None
 
 def analyze_headers(extract_dir, library='onedal'):
     """Analyze all headers and categorize API"""
@@ -73,13 +67,18 @@ def analyze_headers(extract_dir, library='onedal'):
     private_namespaces = set()
     public_namespaces = set()
     
-    for header in headers:
+    # Reading and scanning headers is independent per file: spread it over
+    # processes for large SDKs, then classify the results here in order.
+    if len(headers) >= _PARALLEL_MIN_HEADERS:
+        with ProcessPoolExecutor() as ex:
+            parsed = list(ex.map(_parse_header, headers, chunksize=32))
+    else:
+        parsed = [_parse_header(header) for header in headers]
+    
+    for header, (namespaces, classes) in zip(headers, parsed):
         # Skip if header path contains private indicators
         header_str = str(header)
-        is_private_header = any(keyword in header_str for keyword in ['/detail/', '/internal/', '/backend/'])
-        
-        namespaces = parse_namespace_declarations(header)
-        classes = parse_class_declarations(header)
+        is_private_header = _PRIVATE_PATH_RE.search(header_str) is not None
         
         for ns in namespaces:
             all_namespaces.add(ns)
@@ -36,6 +36,16 @@ setup(
     install_requires=[
         "packaging>=21.0",
     ],
+    extras_require={
+        # Optional accelerators picked up at runtime when importable:
+        # orjson for micromamba/repodata JSON, PyYAML (libyaml-backed loader)
+        # for configs, zstandard for .conda packages and compressed baselines.
+        "fast": [
+            "orjson>=3.9",
+            "PyYAML>=6.0",
+            "zstandard>=0.21",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "abi-scanner=abi_scanner.cli:main",
@@ -1,4 +1,17 @@
-"""Pytest conftest: re-exports helpers from abi_helpers for convenience."""
+"""Pytest conftest: re-exports helpers from abi_helpers for convenience.
+
+Many tests build small file trees under ``tmp_path``. To keep them in RAM,
+point the temp root at a tmpfs, e.g. ``TMPDIR=/dev/shm python -m pytest``
+(as CI does) or ``python -m pytest --basetemp=/dev/shm/pytest-$USER``.
+
+The suite is safe to run in parallel with pytest-xdist; CI uses
+``-n auto --dist loadfile`` so each file's session/module fixtures are built
+by a single worker.
+"""
+from pathlib import PurePath
+
+import pytest
+
 from abi_helpers import (  # noqa: F401
     examples_dir,
     compile_so,
@@ -6,3 +19,13 @@ from abi_helpers import (  # noqa: F401
     make_abi_baseline,
     compare_abi,
 )
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """Fail collection if two test modules share a basename (e.g. a copied test file)."""
+    seen = {}
+    for item in items:
+        path = item.location[0]
+        other = seen.setdefault(PurePath(path).name, path)
+        if other != path:
+            raise pytest.UsageError(f"duplicate test module name: {other} and {path}")
@@ -0,0 +1,28 @@
+"""Shared fixtures for package source adapter tests."""
+
+import io
+import tarfile
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def _sample_tarball_bytes():
+    """Bytes of a fake .tar.bz2 package (lib/libtest.so.1.0, include/test.h), built once."""
+    buf = io.BytesIO()
+    # The tests only inspect members, so compress minimally
+    with tarfile.open(fileobj=buf, mode='w:bz2', compresslevel=1) as tar:
+        for name, data in (('lib/libtest.so.1.0', b'fake library'),
+                           ('include/test.h', b'// header')):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.fixture
+def sample_tarball(tmp_path, _sample_tarball_bytes):
+    """A private copy of the sample .tar.bz2 package, safe for tests to modify."""
+    tarball = tmp_path / 'fake-pkg-1.0.0.tar.bz2'
+    tarball.write_bytes(_sample_tarball_bytes)
+    return tarball
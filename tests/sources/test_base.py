@@ -1,6 +1,6 @@
 """Tests for base PackageSource interface."""
 
-import pytest
+from inspect import isabstract
 from pathlib import Path
 from abi_scanner.sources.base import PackageSource, PackageMetadata
 
@@ -41,8 +41,10 @@ def test_package_metadata_with_paths():
 
 def test_package_source_is_abstract():
     """Test that PackageSource cannot be instantiated directly."""
-    with pytest.raises(TypeError):
-        PackageSource()
+    assert isabstract(PackageSource)
+    assert PackageSource.__abstractmethods__ >= {
+        'download', 'extract', 'find_libraries', 'find_headers'
+    }
 
 
 class DummySource(PackageSource):
@@ -5,16 +5,29 @@ from unittest.mock import Mock, patch
 from abi_scanner.sources.conda import CondaSource
 
 
-@pytest.fixture
-def mock_subprocess():
-    """Mock subprocess.run for all tests."""
+@pytest.fixture(scope='session')
+def conda_source():
+    """Default CondaSource (stateless, shared by all tests)."""
+    return CondaSource()
+
+
+@pytest.fixture(scope='module')
+def _patched_run():
+    """Patch subprocess.run in the conda module once for the whole module."""
     with patch('abi_scanner.sources.conda.subprocess.run') as mock:
-        # Mock successful version check
-        mock.return_value = Mock(returncode=0, stdout='micromamba 1.0.0')
         yield mock
 
 
-def test_conda_source_init_default(mock_subprocess):
+@pytest.fixture(autouse=True)
+def mock_run(_patched_run):
+    """The module-wide subprocess.run mock, reset before every test."""
+    _patched_run.reset_mock(return_value=True, side_effect=True)
+    # Mock successful version check
+    _patched_run.return_value = Mock(returncode=0, stdout='micromamba 1.0.0')
+    return _patched_run
+
+
+def test_conda_source_init_default(mock_run):
     """Test CondaSource initialization with defaults."""
     source = CondaSource()
     
@@ -22,7 +35,7 @@ def test_conda_source_init_default(mock_subprocess):
     assert source.executable == 'micromamba'
     
     # No availability check on init (deferred until download)
-    mock_subprocess.assert_not_called()
+    mock_run.assert_not_called()
 
 
 def test_conda_source_init_custom_channel():
@@ -32,24 +45,18 @@ def test_conda_source_init_custom_channel():
     assert source.channel == 'intel'
 
 
-def test_conda_source_download_missing_executable(tmp_path):
+def test_conda_source_download_missing_executable(mock_run, conda_source, tmp_path):
     """Test CondaSource raises error on download if executable not found."""
-    source = CondaSource()
-    with patch('abi_scanner.sources.conda.subprocess.run') as mock:
-        mock.side_effect = FileNotFoundError()
+    source = conda_source
+    mock_run.side_effect = FileNotFoundError()
 
-        with pytest.raises(RuntimeError, match='micromamba not found'):
-            source.download('test', '1.0.0', tmp_path)
+    with pytest.raises(RuntimeError, match='micromamba not found'):
+        source.download('test', '1.0.0', tmp_path)
 
 
-@patch('abi_scanner.sources.conda.subprocess.run')
-def test_conda_source_download(mock_run, tmp_path):
+def test_conda_source_download(mock_run, conda_source, tmp_path):
     """Test downloading a conda package."""
-    # Mock successful version check
-    mock_run.return_value = Mock(returncode=0)
-    
-    source = CondaSource()
-    mock_run.reset_mock()
+    source = conda_source
     
     # Mock download command
     def mock_download(*args, **kwargs):
@@ -76,13 +83,11 @@ def test_conda_source_download(mock_run, tmp_path):
     assert result.name.startswith('test-1.0.0')
 
 
-@patch('abi_scanner.sources.conda.subprocess.run')
-def test_conda_source_download_cached(mock_run, tmp_path):
+def test_conda_source_download_cached(mock_run, conda_source, tmp_path):
     """Test download skips if package already exists."""
     # Mock version check
     mock_run.return_value = Mock(returncode=0)
-    source = CondaSource()
-    mock_run.reset_mock()
+    source = conda_source
     
     # Create existing package
     existing_pkg = tmp_path / 'test-1.0.0-build.tar.bz2'
@@ -96,35 +101,32 @@ def test_conda_source_download_cached(mock_run, tmp_path):
     assert result == existing_pkg
 
 
-def test_conda_source_extract_tar_bz2(tmp_path):
+def test_conda_source_extract_tar_bz2(conda_source, tmp_path):
     """Test extracting .tar.bz2 conda package."""
-    source = CondaSource()
+    source = conda_source
     
-    # Create a real tar.bz2 file for extraction
+    # Create a real tar.bz2 file for extraction, straight from in-memory content
+    import io
     import tarfile
     package_file = tmp_path / 'test-1.0.0.tar.bz2'
     extract_dir = tmp_path / 'extracted'
     
-    # Create fake package content
-    content_dir = tmp_path / 'content'
-    content_dir.mkdir()
-    (content_dir / 'test.txt').write_text('test content')
-    
-    # Create tar.bz2
-    with tarfile.open(package_file, 'w:bz2') as tar:
-        tar.add(content_dir / 'test.txt', arcname='test.txt')
+    content = b'test content'
+    info = tarfile.TarInfo('test.txt')
+    info.size = len(content)
+    with tarfile.open(package_file, 'w:bz2', compresslevel=1) as tar:
+        tar.addfile(info, io.BytesIO(content))
     
     result = source.extract(package_file, extract_dir)
     
     # Should extract successfully
     assert result == extract_dir
-    assert (extract_dir / 'test.txt').exists()
+    assert (extract_dir / 'test.txt').read_bytes() == b'test content'
 
 
-def test_conda_source_find_libraries(tmp_path):
+def test_conda_source_find_libraries(conda_source, tmp_path):
     """Test finding libraries in conda package."""
-    with patch('abi_scanner.sources.conda.subprocess.run'):
-        source = CondaSource()
+    source = conda_source
     
     # Create fake conda package structure
     lib_dir = tmp_path / 'lib'
@@ -135,14 +137,25 @@ def test_conda_source_find_libraries(tmp_path):
     
     libraries = source.find_libraries(tmp_path, 'test')
     
-    assert len(libraries) == 2
-    assert all('test' in lib.name for lib in libraries)
+    assert {lib.name for lib in libraries} == {'libtest.so.1.0', 'libtest.so.1'}
+
+
+def test_conda_source_find_libraries_keeps_symlinks(conda_source, tmp_path):
+    """Versioned .so symlinks are reported; subdirectories are not."""
+    lib_dir = tmp_path / 'lib'
+    lib_dir.mkdir()
+    (lib_dir / 'libtest.so.1.0').write_text('lib')
+    (lib_dir / 'libtest.so.1').symlink_to('libtest.so.1.0')
+    (lib_dir / 'libtest.so.d').mkdir()
+
+    libraries = conda_source.find_libraries(tmp_path, 'test')
+
+    assert {lib.name for lib in libraries} == {'libtest.so.1.0', 'libtest.so.1'}
 
 
-def test_conda_source_find_headers(tmp_path):
+def test_conda_source_find_headers(conda_source, tmp_path):
     """Test finding headers in conda package."""
-    with patch('abi_scanner.sources.conda.subprocess.run'):
-        source = CondaSource()
+    source = conda_source
     
     # Create fake include directory
     include_dir = tmp_path / 'include'
@@ -153,5 +166,4 @@ def test_conda_source_find_headers(tmp_path):
     
     headers = source.find_headers(tmp_path)
     
-    assert len(headers) == 2
-    assert all(h.suffix in ['.h', '.hpp'] for h in headers)
+    assert set(headers) == {include_dir / 'test.h', include_dir / 'subdir' / 'test2.hpp'}
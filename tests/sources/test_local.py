@@ -1,41 +1,17 @@
 """Tests for LocalSource adapter."""
 
 import pytest
-import tarfile
 from abi_scanner.sources.local import LocalSource
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def local_source():
-    """Create LocalSource instance."""
+    """Create LocalSource instance (stateless, shared by all tests)."""
     return LocalSource()
 
 
-@pytest.fixture
-def sample_tarball(tmp_path):
-    """Create a sample .tar.bz2 package for testing."""
-    # Create a fake package structure
-    pkg_dir = tmp_path / 'fake-pkg'
-    pkg_dir.mkdir()
-    
-    lib_dir = pkg_dir / 'lib'
-    lib_dir.mkdir()
-    (lib_dir / 'libtest.so.1.0').write_text('fake library')
-    
-    include_dir = pkg_dir / 'include'
-    include_dir.mkdir()
-    (include_dir / 'test.h').write_text('// header')
-    
-    # Create tarball
-    tarball = tmp_path / 'fake-pkg-1.0.0.tar.bz2'
-    with tarfile.open(tarball, 'w:bz2') as tar:
-        tar.add(pkg_dir, arcname='.')
-    
-    return tarball
-
-
 def test_local_source_download_file(local_source, sample_tarball, tmp_path):
-    """Test downloading (copying) a local file."""
+    """Test 'downloading' a local file returns it in place (no copy)."""
     output_dir = tmp_path / 'output'
     
     result = local_source.download(
@@ -44,9 +20,8 @@ def test_local_source_download_file(local_source, sample_tarball, tmp_path):
         output_dir
     )
     
-    assert result.exists()
-    assert result.name == sample_tarball.name
-    assert result.parent == output_dir
+    assert result == sample_tarball.resolve()
+    assert not output_dir.exists()
 
 
 def test_local_source_download_directory(local_source, tmp_path):
@@ -112,12 +87,11 @@ def test_local_source_find_libraries(local_source, tmp_path):
     
     # Find all libraries
     libraries = local_source.find_libraries(extract_dir, '')
-    assert len(libraries) == 3
+    assert {lib.name for lib in libraries} == {'libtest.so.1.0', 'libtest.so.1', 'libother.so'}
     
     # Find filtered by name
     test_libs = local_source.find_libraries(extract_dir, 'test')
-    assert len(test_libs) == 2
-    assert all('test' in lib.name for lib in test_libs)
+    assert {lib.name for lib in test_libs} == {'libtest.so.1.0', 'libtest.so.1'}
 
 
 def test_local_source_find_headers(local_source, tmp_path):
@@ -134,5 +108,67 @@ def test_local_source_find_headers(local_source, tmp_path):
     headers = local_source.find_headers(extract_dir)
     
     # Should only find headers in include/ directories
-    assert len(headers) == 2
-    assert all('/include/' in str(h) for h in headers)
+    assert set(headers) == {include_dir / 'test.h', include_dir / 'test.hpp'}
+
+
+def test_walk_files_does_not_follow_directory_symlinks(tmp_path):
+    """walk_files yields files and links but, like rglob, does not descend into linked dirs."""
+    from abi_scanner.sources.utils import walk_files
+
+    lib_dir = tmp_path / 'lib'
+    lib_dir.mkdir()
+    (lib_dir / 'libtest.so.1').write_text('lib')
+    (lib_dir / 'libtest.so').symlink_to('libtest.so.1')
+    (tmp_path / 'lib64').symlink_to('lib', target_is_directory=True)
+
+    assert sorted(walk_files(tmp_path)) == sorted([
+        lib_dir / 'libtest.so.1', lib_dir / 'libtest.so', tmp_path / 'lib64'])
+    assert list(walk_files(tmp_path / 'missing')) == []
+
+
+def test_scan_tree_splits_headers_and_shared_objects(tmp_path):
+    """scan_tree sorts one walk into headers and .so files (links included)."""
+    from abi_scanner.sources.utils import scan_tree
+
+    (tmp_path / 'include' / 'sub').mkdir(parents=True)
+    (tmp_path / 'include' / 'a.h').write_text('')
+    (tmp_path / 'include' / 'sub' / 'b.hpp').write_text('')
+    (tmp_path / 'lib').mkdir()
+    (tmp_path / 'lib' / 'libtest.so.1').write_text('lib')
+    (tmp_path / 'lib' / 'libtest.so').symlink_to('libtest.so.1')
+    (tmp_path / 'README').write_text('')
+
+    headers, libs = scan_tree(tmp_path)
+
+    assert set(headers) == {tmp_path / 'include' / 'a.h', tmp_path / 'include' / 'sub' / 'b.hpp'}
+    assert set(libs) == {tmp_path / 'lib' / 'libtest.so.1', tmp_path / 'lib' / 'libtest.so'}
+
+
+@pytest.mark.parametrize('mode', ['w', 'w:gz', 'w:bz2', 'w:xz'])
+def test_open_tar_reads_plain_and_compressed(tmp_path, mode):
+    """open_tar hands safe_extract_tar a readable TarFile for every tar compression."""
+    import io
+    import tarfile
+    from abi_scanner.sources.utils import open_tar, safe_extract_tar
+
+    archive = tmp_path / 'pkg.tar'
+    with tarfile.open(archive, mode) as tar:
+        info = tarfile.TarInfo('include/test.h')
+        info.size = 9
+        tar.addfile(info, io.BytesIO(b'// header'))
+
+    with open_tar(archive) as tar:
+        safe_extract_tar(tar, tmp_path / 'out')
+    assert (tmp_path / 'out' / 'include' / 'test.h').read_bytes() == b'// header'
+
+
+def test_open_tar_corrupt_archive_raises_read_error(tmp_path):
+    """A truncated compressed stream surfaces as tarfile.ReadError, as tarfile.open would."""
+    import tarfile
+    from abi_scanner.sources.utils import open_tar
+
+    archive = tmp_path / 'broken.tar.bz2'
+    archive.write_bytes(b'BZh91AY&SY' + b'\0' * 16)
+    with pytest.raises(tarfile.ReadError):
+        with open_tar(archive):
+            pass
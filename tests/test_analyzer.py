@@ -12,10 +12,20 @@ def test_public_api_filter_private_patterns_win():
     assert filt.is_public("tbb::detail::r1::task") is False
 
 
+def test_public_api_filter_namespace_boundaries():
+    filt = PublicAPIFilter(public_namespaces=["oneapi::dal", "daal"])
+
+    assert filt.is_public("daal::algorithms::kmeans::Batch") is True
+    assert filt.is_public("oneapi::dal::train") is True
+    assert filt.is_public("daalx::foo") is False
+    assert filt.is_public("oneapi::dalx::foo") is False
+
+
 def test_public_api_filter_without_namespaces_defaults_public():
     filt = PublicAPIFilter()
     assert filt.is_public("any::symbol") is True
     assert filt.is_public("mkl_internal_symbol") is False
+    assert filt.is_public("_ZN4daal8internal3fooEv") is False
 
 
 def test_public_api_filter_from_missing_json(tmp_path):
@@ -0,0 +1,322 @@
+"""Unit tests for the baseline/diff cache helpers in scripts/compare_all_history.py."""
+import argparse
+import io
+import json
+import struct
+import tarfile
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from abi_scanner.module_scanner import SymbolClassifier
+from abi_scanner.sources.utils import walk_files
+from scripts.compare_all_history import (
+    _abidw_version,
+    _baseline_from_library,
+    _compress_baseline,
+    _content_digest,
+    _fetch_repodata_index,
+    _is_shared_object,
+    _elf_build_id,
+    _find_baseline,
+    _load_index,
+    _plain_baseline,
+    _reuse_baseline,
+    _save_index,
+    _summary_stats,
+    compare_abi,
+    download_conda_direct,
+    find_library,
+    generate_abi_baseline,
+    get_package_versions,
+    get_cached_versions,
+)
+
+
+def test_compressed_baseline_round_trip(tmp_path):
+    abi = tmp_path / "dal_all_2025.0.0.abi"
+    content = b"<abi-corpus>" + b"<elf-symbol name='x'/>" * 1000 + b"</abi-corpus>"
+    abi.write_bytes(content)
+
+    packed = _compress_baseline(abi)
+
+    assert not abi.exists()
+    assert packed.suffix in (".zst", ".gz")
+    assert packed.stat().st_size < len(content)
+    assert _find_baseline(abi) == packed
+    with _plain_baseline(packed) as plain:
+        assert plain.read_bytes() == content
+
+
+def test_find_baseline_prefers_plain_file(tmp_path):
+    abi = tmp_path / "x.abi"
+    assert _find_baseline(abi) is None
+    abi.write_bytes(b"a")
+    (tmp_path / "x.abi.gz").write_bytes(b"b")
+    assert _find_baseline(abi) == abi
+    with _plain_baseline(abi) as plain:
+        assert plain == abi
+
+
+def test_get_cached_versions(tmp_path):
+    for name in ("dal_all_2025.10.0.abi", "dal_all_2025.2.0.abi.gz", "dal_all_2024.1.0.abi.zst",
+                 "dal_libonedal_so_2025.0.0.abi", "daal_all_2025.0.0.abi", "dal_all_x.json"):
+        (tmp_path / name).write_bytes(b"")
+    assert get_cached_versions(tmp_path, "dal", "all") == ["2024.1.0", "2025.2.0", "2025.10.0"]
+
+
+def test_find_library_prefers_lib_dir(tmp_path):
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "pkgs" / "foo").mkdir(parents=True)
+    (tmp_path / "pkgs" / "foo" / "libfoo.so").write_bytes(b"")
+    (tmp_path / "lib" / "libfoo.so.1").write_bytes(b"")
+    assert find_library(tmp_path, "foo") == tmp_path / "lib" / "libfoo.so.1"
+
+
+def test_find_library_falls_back_to_full_walk(tmp_path):
+    (tmp_path / "lib").mkdir()
+    (tmp_path / "lib" / "libbar.so").write_bytes(b"")
+    (tmp_path / "opt").mkdir()
+    (tmp_path / "opt" / "libfoo.so").write_bytes(b"")
+    assert find_library(tmp_path, "foo") == tmp_path / "opt" / "libfoo.so"
+    assert find_library(tmp_path / "missing", "foo") is None
+
+
+def test_baseline_index_round_trip(tmp_path):
+    assert _load_index(tmp_path) == {}
+    index = {"dal_all_2025.0.0.abi": {"version": "2025.0.0", "status": "failed"}}
+    _save_index(tmp_path, index)
+    assert _load_index(tmp_path) == index
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+    (tmp_path / "index.json").write_text("{not json")
+    assert _load_index(tmp_path) == {}
+
+
+def test_compare_abi_identical_baselines_skip_abidiff(tmp_path, monkeypatch):
+    old, new = tmp_path / "a.abi", tmp_path / "b.abi"
+    old.write_bytes(b"<abi-corpus/>")
+    new.write_bytes(b"<abi-corpus/>")
+    monkeypatch.setenv("PATH", str(tmp_path))  # abidiff must not be needed
+
+    assert compare_abi(old, new) == (0, {"public": {"removed": 0, "added": 0}}, "", None)
+    exit_code, stats, _, symbols = compare_abi(old, new, classifier=SymbolClassifier())
+    assert exit_code == 0
+    assert symbols["public"] == {"removed": [], "added": []}
+    assert stats["preview"] == {"removed": 0, "added": 0}
+
+
+def test_get_package_versions_reuses_cached_search(tmp_path, monkeypatch):
+    import subprocess
+    import scripts.compare_all_history as cah
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        out = b'{"result": {"pkgs": [{"version": "2025.1.0"}, {"version": "2024.7.0"}]}}'
+        return subprocess.CompletedProcess(cmd, 0, stdout=out, stderr=b"")
+
+    monkeypatch.setattr(cah, "_MICROMAMBA_CACHE", "micromamba")
+    monkeypatch.setattr(cah.subprocess, "run", fake_run)
+    for _ in range(2):
+        assert get_package_versions("conda-forge", "dal", cache_dir=tmp_path, ttl=60) == [
+            "2024.7.0", "2025.1.0"]
+    assert len(calls) == 1
+    get_package_versions("conda-forge", "dal", cache_dir=tmp_path, ttl=0)
+    assert len(calls) == 2
+
+
+def _elf_with_build_id(build_id: bytes) -> bytes:
+    """Minimal little-endian ELF64 image with one PT_NOTE holding a GNU build-id."""
+    note = struct.pack("<III", 4, len(build_id), 3) + b"GNU\0" + build_id
+    phoff, phentsize = 64, 56
+    note_off = phoff + phentsize
+    header = (b"\x7fELF" + bytes([2, 1, 1]) + bytes(9)
+              + struct.pack("<HHIQQQIHHHHHH", 3, 62, 1, 0, phoff, 0, 0, 64, phentsize, 1, 0, 0, 0))
+    phdr = struct.pack("<IIQQQQQQ", 4, 4, note_off, 0, 0, len(note), len(note), 4)
+    return header + phdr + note
+
+
+def test_elf_build_id(tmp_path):
+    lib = tmp_path / "libfoo.so"
+    lib.write_bytes(_elf_with_build_id(bytes(range(20))))
+    assert _elf_build_id(lib) == bytes(range(20)).hex()
+    lib.write_bytes(b"not an elf file")
+    assert _elf_build_id(lib) is None
+    assert _elf_build_id(tmp_path / "missing.so") is None
+
+
+def test_reuse_baseline_links_matching_build_id(tmp_path):
+    old = tmp_path / "dal_all_2025.0.0.abi.gz"
+    old.write_bytes(b"baseline")
+    index = {old.name[:-3]: {"status": "ok", "abi": old.name, "build_id": "ab",
+                              "abi_digest": _content_digest(old)}}
+    new = tmp_path / "dal_all_2025.0.1.abi"
+    assert not _reuse_baseline("cd", "2025.0.1", new, index)
+    assert not _reuse_baseline("ab", "2025.0.1", tmp_path / "daal_all_2025.0.1.abi", index)
+    assert _reuse_baseline("ab", "2025.0.1", new, index)
+    assert (tmp_path / "dal_all_2025.0.1.abi.gz").read_bytes() == b"baseline"
+    assert not new.exists()
+
+
+def test_build_id_reuse_requires_same_headers(tmp_path, monkeypatch):
+    log = tmp_path / "abidw.log"
+    fake = tmp_path / "abidw"
+    fake.write_text(f'#!/bin/sh\necho "$@" >> {log}\n'
+                    '[ "$1" = --version ] && echo "abidw: 2.4.0" && exit 0\n'
+                    'echo "<abi-corpus/>" > "$2"\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    _abidw_version.cache_clear()
+    lib = tmp_path / "libdal.so"
+    lib.write_bytes(_elf_with_build_id(b"\xab" * 20))
+    headers = tmp_path / "include"
+    headers.mkdir()
+    (headers / "dal.h").write_text("int f();")
+    index = {}
+    args = argparse.Namespace(verbose=False, compress_cache=False, _suppressions=None,
+                              _baseline_index=index)
+
+    def build(ver):
+        abi = tmp_path / f"dal_all_{ver}.abi"
+        info = _baseline_from_library(lib, ver, abi, headers, args)
+        assert info is not None
+        index[abi.name] = {"status": "ok", "abi": abi.name,
+                           "abi_digest": _content_digest(abi), **info}
+        return sum(not line.startswith("--version") for line in log.read_text().splitlines())
+
+    try:
+        assert build("2025.0.0") == 1
+        assert build("2025.0.1") == 1  # same build-id and headers: linked, no abidw
+        (headers / "dal.h").write_text("int f(int);")
+        assert build("2025.0.2") == 2  # same build-id, new headers: abidw runs
+    finally:
+        _abidw_version.cache_clear()
+
+
+def test_generate_abi_baseline_streams_into_compressed_file(tmp_path, monkeypatch):
+    fake = tmp_path / "abidw"
+    fake.write_text('#!/bin/sh\n[ "$1" = --out-file ] && exit 9\necho "<abi-corpus args=\'$*\'/>"\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", str(tmp_path))
+    abi = tmp_path / "dal_all_2025.0.0.abi"
+
+    assert generate_abi_baseline(tmp_path / "libdal.so", abi, compress=True)
+
+    stored = _find_baseline(abi)
+    assert stored is not None and stored.suffix in (".zst", ".gz")
+    with _plain_baseline(stored) as plain:
+        assert plain.read_bytes() == (
+            f"<abi-corpus args='--no-corpus-path {tmp_path / 'libdal.so'}'/>\n".encode())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["abidw", stored.name]
+
+
+def test_generate_baseline_falls_back_to_micromamba_when_library_missing(tmp_path, monkeypatch):
+    import scripts.compare_all_history as cah
+
+    calls = []
+
+    def fake_download(channel, package, version, env_path, devel_package=None, verbose=False,
+                      root_prefix=None, base_url=None, cache_dir=None):
+        calls.append(base_url)
+        (env_path / "lib").mkdir(parents=True)
+        if base_url is None:  # only the solved environment has the library
+            (env_path / "lib" / "libdal.so").write_bytes(b"lib")
+        return True
+
+    monkeypatch.setattr(cah, "download_packages", fake_download)
+    monkeypatch.setattr(cah, "_baseline_from_library",
+                        lambda lib, ver, abi_path, headers, args: {"lib": lib.name})
+    args = argparse.Namespace(channel="conda-forge", package="dal", devel_package=None,
+                              verbose=False, conda_base_url="https://conda.example",
+                              library_name=None, headers_subdir="include")
+
+    info = cah._generate_baseline("2025.0.0", tmp_path / "dal_all_2025.0.0.abi", args,
+                                  tmp_path, {}, None, None)
+
+    assert info == {"lib": "libdal.so"}
+    assert calls == ["https://conda.example", None]
+
+
+def test_download_conda_direct_unpacks_newest_build(tmp_path):
+    subdir = tmp_path / "chan" / "linux-64"
+    subdir.mkdir(parents=True)
+    packages = {}
+    for build, payload in ((0, b"old build"), (1, b"new build")):
+        fn = f"dal-2025.0.0-h_{build}.tar.bz2"
+        with tarfile.open(subdir / fn, "w:bz2") as tar:
+            info = tarfile.TarInfo("lib/libonedal.so.3")
+            info.size = len(payload)
+            tar.addfile(info, io.BytesIO(payload))
+            header = tarfile.TarInfo("include/oneapi/dal.hpp")
+            header.size = 2
+            tar.addfile(header, io.BytesIO(b"//"))
+            link = tarfile.TarInfo("lib/libonedal.so")
+            link.type, link.linkname = tarfile.SYMTYPE, "libonedal.so.3"
+            tar.addfile(link)
+        packages[fn] = {"name": "dal", "version": "2025.0.0", "build_number": build}
+    (subdir / "repodata.json").write_text(json.dumps({"packages": packages}))
+
+    env = tmp_path / "env"
+    assert download_conda_direct("chan", [("dal", "2025.0.0")], env, tmp_path.as_uri())
+    assert (env / "lib" / "libonedal.so.3").read_bytes() == b"new build"
+    assert not (env / "lib" / "libonedal.so").exists()
+    assert (env / "include" / "oneapi" / "dal.hpp").exists()
+
+    libs_only = tmp_path / "libs_only"
+    assert download_conda_direct("chan", [("dal", "2025.0.0")], libs_only, tmp_path.as_uri(),
+                                 keep=lambda name, member: _is_shared_object(member))
+    assert [p.relative_to(libs_only).as_posix() for p in walk_files(libs_only)] == [
+        "lib/libonedal.so.3"]
+    assert not download_conda_direct("chan", [("dal", "2026.0.0")], tmp_path / "env2", tmp_path.as_uri())
+
+
+def test_repodata_index_revalidated_by_etag(tmp_path):
+    import http.server
+    import threading
+
+    body = json.dumps({"packages.conda": {
+        "dal-2025.0.0-h_0.conda": {"name": "dal", "version": "2025.0.0", "build_number": 0}}}).encode()
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/chan/linux-64"
+        first = _fetch_repodata_index(url, tmp_path)
+        second = _fetch_repodata_index(url, tmp_path)
+    finally:
+        server.shutdown()
+    assert requests == [None, '"v1"']
+    assert first == second == {("dal", "2025.0.0"): [
+        ("dal-2025.0.0-h_0.conda", {"build_number": 0, "timestamp": 0})]}
+
+
+def test_summary_stats_reads_first_summary_line():
+    lines = iter([
+        "Functions changes summary: 0 Removed, 0 Changed, 0 Added function\n",
+        "Function symbols changes summary: 3 Removed (1 filtered out), 2 Added function symbols "
+        "not referenced by debug info\n",
+        "Function symbols changes summary: 9 Removed, 9 Added\n",
+    ])
+    assert _summary_stats(lines) == {"public": {"removed": 3, "added": 2}}
+    # the parser stops at the match and leaves the rest for the caller to drain
+    assert next(lines).startswith("Function symbols changes summary: 9")
+    assert _summary_stats(()) == {"public": {"removed": 0, "added": 0}}
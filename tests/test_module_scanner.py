@@ -0,0 +1,331 @@
+"""Tests for module_scanner symbol classification and abidiff parsing."""
+
+import io
+import shutil
+
+import pytest
+
+from abi_scanner import module_scanner
+from abi_scanner.module_scanner import (
+    SymbolClassifier,
+    extract_symbol_lists,
+    parse_abidiff_symbols,
+)
+
+
+ABIDIFF_OUTPUT = """\
+Functions changes summary: 0 Removed, 0 Changed, 0 Added function
+Variables changes summary: 0 Removed, 0 Changed, 0 Added variable
+Function symbols changes summary: 3 Removed, 2 Added function symbols not referenced by debug info
+Variable symbols changes summary: 0 Removed, 0 Added variable symbol not referenced by debug info
+
+3 Removed function symbols not referenced by debug info:
+
+  [D] _ZN6oneapi3dal6detail2v13fooEv
+  [D] _ZN6oneapi3dal7preview3barEv
+  [D] _ZN6oneapi3dal5train3bazEv
+
+2 Added function symbols not referenced by debug info:
+
+  [A] _ZN6oneapi3dal5train4baz2Ev
+  [A] mkl_serv_thing
+
+"""
+
+needs_cxxfilt = pytest.mark.skipif(
+    shutil.which("c++filt") is None and module_scanner._IN_PROCESS_DEMANGLE is None,
+    reason="no C++ demangler available")
+needs_in_process = pytest.mark.skipif(module_scanner._IN_PROCESS_DEMANGLE is None,
+                                      reason="no in-process demangler available")
+
+
+@pytest.mark.parametrize("symbol,expected", [
+    ("oneapi::dal::detail::v1::foo()", "internal"),
+    ("oneapi::dal::backend::bar()", "internal"),
+    ("tbb::task::spawn()", "internal"),
+    ("mkl_serv_malloc", "internal"),
+    ("daal::algorithms::internal::Kernel::compute()", "internal"),
+    ("oneapi::dal::preview::graph()", "preview"),
+    ("sycl::ext::experimental::foo()", "preview"),
+    ("oneapi::dal::train()", "public"),
+    ("detail::foo()", "public"),
+    pytest.param("_ZN6oneapi3dal6detail2v13fooEv", "internal", marks=needs_cxxfilt),
+    pytest.param("_ZN6oneapi3dal7preview3barEv", "preview", marks=needs_cxxfilt),
+    pytest.param("_ZN6oneapi3dal5train3bazEv", "public", marks=needs_cxxfilt),
+    pytest.param("_ZN3tbb6detail2r14task5spawnEv", "internal", marks=needs_cxxfilt),
+    pytest.param("_ZN6detail3fooEv", "public", marks=needs_cxxfilt),
+    pytest.param("_ZN6oneapi3dal6detailEv", "public", marks=needs_cxxfilt),
+])
+def test_classify(symbol, expected):
+    assert SymbolClassifier().classify(symbol) == expected
+
+
+@pytest.mark.parametrize("symbol", [
+    "_ZN6oneapi3dal6detail2v13fooEv",
+    "_ZNK6oneapi3dal7backend6kernel7computeEv",
+    "_ZN3tbb6detail2r14task5spawnEv",
+    "_ZN4daal10algorithms8internal6KernelC1Ev",
+])
+def test_classify_mangled_internal_skips_demangle(monkeypatch, symbol):
+    def _fail(_):
+        raise AssertionError("demangle_symbol should not be called")
+    monkeypatch.setattr(module_scanner, "demangle_symbol", _fail)
+    assert SymbolClassifier().classify(symbol) == "internal"
+
+
+def test_classify_internal_wins_over_preview():
+    classifier = SymbolClassifier()
+    assert classifier.classify("oneapi::dal::preview::detail::foo()") == "internal"
+    assert classifier.classify("oneapi::dal::preview::foo(oneapi::dal::detail::x)") == "internal"
+
+
+@needs_cxxfilt
+def test_parse_abidiff_symbols_counts():
+    stats = parse_abidiff_symbols(ABIDIFF_OUTPUT, SymbolClassifier())
+    assert stats == {
+        "public": {"removed": 1, "added": 1},
+        "preview": {"removed": 1, "added": 0},
+        "internal": {"removed": 1, "added": 1},
+    }
+
+
+@needs_cxxfilt
+def test_extract_symbol_lists_demangles():
+    lists = extract_symbol_lists(ABIDIFF_OUTPUT, SymbolClassifier())
+    assert lists["public"]["removed"] == ["oneapi::dal::train::baz()"]
+    assert lists["public"]["added"] == ["oneapi::dal::train::baz2()"]
+    assert lists["preview"]["removed"] == ["oneapi::dal::preview::bar()"]
+    assert lists["internal"]["removed"] == ["oneapi::dal::detail::v1::foo()"]
+    assert lists["internal"]["added"] == ["mkl_serv_thing"]
+
+
+def test_parse_abidiff_symbols_demangles_in_one_batch(monkeypatch):
+    calls = []
+
+    def fake_demangle_many(symbols):
+        calls.append(list(symbols))
+        return [f"ns::{sym}" for sym in symbols]
+
+    monkeypatch.setattr(module_scanner, "_IN_PROCESS_DEMANGLE", None)
+    monkeypatch.setattr(module_scanner._CXXFILT, "demangle_many", fake_demangle_many)
+    parse_abidiff_symbols(ABIDIFF_OUTPUT, SymbolClassifier())
+    # Internal and preview symbols are classified from the mangled name alone.
+    assert calls == [[
+        "_ZN6oneapi3dal5train3bazEv",
+        "_ZN6oneapi3dal5train4baz2Ev",
+    ]]
+
+
+@needs_in_process
+@pytest.mark.parametrize("symbol,expected", [
+    ("_ZN6oneapi3dal5train3bazEv", "oneapi::dal::train::baz()"),
+    ("_Z3foov@@LIBFOO_1.0", "foo()@@LIBFOO_1.0"),
+    ("mkl_serv_thing", "mkl_serv_thing"),
+    ("_Znotmangled", "_Znotmangled"),
+])
+def test_demangle_in_process(symbol, expected):
+    assert module_scanner.demangle_symbol(symbol) == expected
+
+
+def test_classify_honours_overridden_patterns():
+    class TbbPublic(SymbolClassifier):
+        internal_patterns = (r"::detail::",)
+
+    assert TbbPublic().classify("tbb::task_group::wait()") == "public"
+    assert SymbolClassifier().classify("tbb::task_group::wait()") == "internal"
+
+
+def test_classify_empty_pattern_list_never_matches():
+    class NoInternal(SymbolClassifier):
+        internal_patterns = ()
+
+    assert NoInternal().classify("oneapi::dal::detail::foo()") == "public"
+    assert NoInternal().classify("oneapi::dal::preview::foo()") == "preview"
+
+
+@needs_cxxfilt
+def test_parse_abidiff_lists_match_stats():
+    symbols = module_scanner.parse_abidiff(ABIDIFF_OUTPUT, SymbolClassifier())
+    assert symbols == extract_symbol_lists(ABIDIFF_OUTPUT, SymbolClassifier())
+    assert module_scanner.symbol_stats(symbols) == parse_abidiff_symbols(
+        ABIDIFF_OUTPUT, SymbolClassifier())
+
+
+def test_parse_abidiff_ignores_changed_section():
+    stdout = "1 Changed function:\n\n  [C] 'function void foo()' has some changes\n"
+    stats = parse_abidiff_symbols(stdout, SymbolClassifier())
+    assert all(n == 0 for actions in stats.values() for n in actions.values())
+    assert module_scanner.parse_abidiff(stdout, SymbolClassifier())["public"] == {
+        "removed": [], "added": []}
+
+
+def test_iter_abidiff_symbols_accepts_line_iterables():
+    from_text = list(module_scanner.iter_abidiff_symbols(ABIDIFF_OUTPUT))
+    from_lines = list(module_scanner.iter_abidiff_symbols(
+        iter(ABIDIFF_OUTPUT.splitlines(keepends=True))))
+    assert from_lines == from_text
+    assert len(from_text) == 5
+
+
+def test_relevant_lines_skip_change_details():
+    report = (
+        "1 function with some indirect sub-type change:\n"
+        "  [C] 'function void foo(T*)' at a.cpp:1:1 has some indirect sub-type changes:\n"
+        "    parameter 1 of type 'T*' has sub-type changes:\n"
+        "      type size hasn't changed\n"
+        "1 Removed function symbol not referenced by debug info:\n"
+        "  [D] _Z3barv"
+    )
+    lines = list(module_scanner._relevant_lines(report))
+    assert lines == [
+        "  [C] 'function void foo(T*)' at a.cpp:1:1 has some indirect sub-type changes:",
+        "1 Removed function symbol not referenced by debug info:",
+        "  [D] _Z3barv",
+    ]
+    assert list(module_scanner.iter_abidiff_symbols(report)) == [("removed", "_Z3barv")]
+
+
+def test_parse_abidiff_stops_after_zero_summary():
+    changed_only = (
+        "Functions changes summary: 0 Removed, 1 Changed, 0 Added function\n"
+        "Variables changes summary: 0 Removed, 0 Changed, 0 Added variable\n"
+        "\n"
+        "1 Changed function:\n"
+        "  [C] 'function void foo(int)'\n"
+        "1 Removed function:\n"  # never present after a zero summary; proves it is not read
+        "  [D] 'function void bar()'\n"
+    )
+    classifier = module_scanner.SymbolClassifier()
+    # The generator itself still reports every entry, changed ones included.
+    assert list(module_scanner.iter_abidiff_symbols(changed_only)) == [
+        ("changed", "function void foo(int)"), ("removed", "function void bar()")]
+    assert module_scanner.parse_abidiff(changed_only, classifier)["public"] == {
+        "removed": [], "added": []}
+    assert module_scanner.parse_abidiff_symbols(changed_only, classifier)["public"] == {
+        "removed": 0, "added": 0}
+    leaf_mode = (
+        "Leaf changes summary: 1 artifact changed\n"
+        "Changed leaf types summary: 0 leaf type changed\n"
+        "Removed/Changed/Added functions summary: 1 Removed, 0 Changed, 0 Added function\n"
+        "\n"
+        "1 Removed function:\n"
+        "  [D] 'function void foo()'\n"
+    )
+    assert module_scanner.parse_abidiff(leaf_mode, classifier)["public"] == {
+        "removed": ["function void foo()"], "added": []}
+
+def test_iter_abidiff_symbols_reads_streams_in_chunks():
+    expected = list(module_scanner.iter_abidiff_symbols(ABIDIFF_OUTPUT))
+    assert list(module_scanner.iter_abidiff_symbols(io.StringIO(ABIDIFF_OUTPUT))) == expected
+    # Chunk boundaries falling inside lines must not split or drop entries.
+    lines = list(module_scanner._relevant_stream_lines(io.StringIO(ABIDIFF_OUTPUT), chunk_size=7))
+    assert lines == list(module_scanner._relevant_lines(ABIDIFF_OUTPUT))
+
+
+def test_pattern_rules_split_literals_from_regexes():
+    prefixes, substrings, regex = module_scanner.pattern_rules(
+        module_scanner._INTERNAL_PATTERNS)
+    assert prefixes == ("mkl_serv_", "tbb::")
+    assert "::detail::" in substrings
+    assert regex.pattern == r"^daal::.*::internal::"
+
+
+@pytest.mark.parametrize("symbol,expected", [
+    ("_ZN6oneapi3dal7preview3barEv", "preview"),
+    ("_ZN6oneapi3dal12experimental3barEv", "preview"),
+    ("_ZN6oneapi3dal7preview6detail3barEv", "internal"),
+    # A detail scope later in the name (e.g. a parameter type) must win, so
+    # the shortcut gives up and leaves the decision to the demangled text.
+    ("_ZN6oneapi3dal7preview3barENS0_6detail3bazE", None),
+    ("_ZN6oneapi3dal5train3bazEv", None),
+    ("_ZN7preview3barEv", None),
+    # Template function: demangles to "tbb::task oneapi::dal::preview::foo<int>(int)",
+    # which ^tbb:: makes internal, so the shortcut must not say preview.
+    ("_ZN6oneapi3dal7preview3fooIiEEN3tbb4taskET_", None),
+])
+def test_mangled_category(symbol, expected):
+    assert module_scanner._mangled_category(symbol) == expected
+
+
+@needs_cxxfilt
+@pytest.mark.parametrize("symbol", [
+    "_ZN3tbb3fooIiEEvT_",  # void tbb::foo<int>(int): return type comes first
+    "_ZN3tbb6detail2r14task5spawnEv",
+    "_ZN6oneapi3dal7preview3barEv",
+    "_ZN4daal10algorithms8internal6KernelC1Ev",
+])
+def test_classify_symbol_matches_demangled_verdict(symbol):
+    expected = module_scanner._classify(module_scanner.demangle_symbol(symbol))
+    assert module_scanner.classify_symbol(symbol) == expected
+
+
+class _PlainClassifier:
+    """A classifier that only implements classify()."""
+
+    def classify(self, symbol):
+        return "public"
+
+
+def test_parse_abidiff_symbols_accepts_plain_classifier():
+    stats = module_scanner.parse_abidiff_symbols(ABIDIFF_OUTPUT, _PlainClassifier())
+    assert stats["public"] == {"removed": 3, "added": 2}
+
+
+class _NaiveAutomaton:
+    """Stand-in for ahocorasick.Automaton with the same iter() contract."""
+
+    def __init__(self):
+        self.words = {}
+
+    def add_word(self, key, value):
+        self.words[key] = value
+
+    def __len__(self):
+        return len(self.words)
+
+    def make_automaton(self):
+        pass
+
+    def iter(self, haystack):
+        for key, value in self.words.items():
+            start = haystack.find(key)
+            if start >= 0:
+                yield start + len(key) - 1, value
+
+
+def test_classify_with_substring_automaton(monkeypatch):
+    fake = type("ahocorasick", (), {"Automaton": _NaiveAutomaton})
+    monkeypatch.setattr(module_scanner, "_ahocorasick", fake)
+    module_scanner._substring_automaton.cache_clear()
+    module_scanner._classify.cache_clear()
+    try:
+        classify = module_scanner._classify
+        assert classify("oneapi::dal::preview::foo(oneapi::dal::detail::x)") == "internal"
+        assert classify("oneapi::dal::preview::foo()") == "preview"
+        assert classify("tbb::task::run()") == "internal"
+        assert classify("oneapi::dal::train()") == "public"
+    finally:
+        module_scanner._substring_automaton.cache_clear()
+        module_scanner._classify.cache_clear()
+
+
+def test_iter_abidiff_symbols_dwarf_sections_and_reset():
+    stdout = (
+        "1 Removed function:\n\n  [D] 'function void foo()'    {_Z3foov}\n\n"
+        "2 Added variables:\n\n  [A] 'int bar'\n\n"
+        "1 Unreferenced symbols:\n\n  [A] baz\n"
+    )
+    assert list(module_scanner.iter_abidiff_symbols(stdout)) == [
+        ("removed", "function void foo()"),
+        ("added", "int bar"),
+    ]
+
+
+@pytest.mark.parametrize("symbol", [
+    "oneapi::dal::detail::v1::foo()",
+    "oneapi::dal::preview::bar()",
+    "oneapi::dal::train::baz()",
+    "mkl_serv_malloc",
+])
+def test_classify_symbol_matches_default_classifier(symbol):
+    assert module_scanner.classify_symbol(symbol) == SymbolClassifier().classify(symbol)
@@ -1,107 +1,74 @@
 """Unit tests for package_spec module."""
 
 import tempfile
-import unittest
 from pathlib import Path
+
+import pytest
+
 from abi_scanner.package_spec import PackageSpec, validate_spec
 
 
-class TestPackageSpec(unittest.TestCase):
-    """Test PackageSpec parser."""
-    
-    def test_standard_format(self):
-        """Test standard channel:package=version format."""
-        spec = PackageSpec.parse("conda-forge:dal=2025.9.0")
-        self.assertEqual(spec.channel, "conda-forge")
-        self.assertEqual(spec.package, "dal")
-        self.assertEqual(spec.version, "2025.9.0")
-        self.assertIsNone(spec.path)
-    
-    def test_intel_channel(self):
-        """Test Intel channel."""
-        spec = PackageSpec.parse("intel:mkl=2025.1.0")
-        self.assertEqual(spec.channel, "intel")
-        self.assertEqual(spec.package, "mkl")
-        self.assertEqual(spec.version, "2025.1.0")
-    
-    def test_apt_channel(self):
-        """Test APT channel."""
-        spec = PackageSpec.parse("apt:intel-oneapi-dal=2025.9.0")
-        self.assertEqual(spec.channel, "apt")
-        self.assertEqual(spec.package, "intel-oneapi-dal")
-        self.assertEqual(spec.version, "2025.9.0")
-    
-    def test_string_representation(self):
-        """Test __str__ method."""
-        spec = PackageSpec.parse("conda-forge:dal=2025.9.0")
-        self.assertEqual(str(spec), "conda-forge:dal=2025.9.0")
-    
-    def test_missing_colon(self):
-        """Test error on missing colon."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("invalid-spec")
-        self.assertIn("Invalid package spec", str(cm.exception))
-    
-    def test_missing_version(self):
-        """Test error on missing version."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("conda-forge:dal")
-        self.assertIn("Invalid package spec", str(cm.exception))
-    
-    def test_empty_package(self):
-        """Test error on empty package name."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("conda-forge:=2025.9.0")
-        self.assertIn("Empty package name", str(cm.exception))
-    
-    def test_empty_version(self):
-        """Test error on empty version."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("conda-forge:dal=")
-        self.assertIn("Empty version", str(cm.exception))
-    
-    def test_whitespace_handling(self):
-        """Test that whitespace is stripped."""
-        spec = PackageSpec.parse("  conda-forge : dal = 2025.9.0  ")
-        self.assertEqual(spec.channel, "conda-forge")
-        self.assertEqual(spec.package, "dal")
-        self.assertEqual(spec.version, "2025.9.0")
-    
-    def test_validate_spec_valid(self):
-        """Test validate_spec with valid input."""
-        self.assertTrue(validate_spec("conda-forge:dal=2025.9.0"))
-    
-    def test_validate_spec_invalid(self):
-        """Test validate_spec with invalid input."""
-        self.assertFalse(validate_spec("invalid"))
-        self.assertFalse(validate_spec("conda-forge:dal"))
-
-    def test_local_path(self):
-        """Test local:/path parsing."""
-        with tempfile.NamedTemporaryFile(suffix=".so") as tmp:
-            spec = PackageSpec.parse(f"local:{tmp.name}")
-            self.assertEqual(spec.channel, "local")
-            self.assertEqual(spec.path, Path(tmp.name).resolve())
-            self.assertEqual(spec.package, Path(tmp.name).stem)
-            self.assertIsNone(spec.version)
-            self.assertEqual(str(spec), f"local:{Path(tmp.name).resolve()}")
-
-    def test_local_path_missing(self):
-        """Test local path validation when file does not exist."""
-        self.assertFalse(validate_spec("local:/definitely/not/found/lib.so"))
-
-    def test_local_path_directory(self):
-        """Test local path must be a file, not a directory."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("local:.")
-        self.assertIn("not a file", str(cm.exception))
-
-    def test_unsupported_channel(self):
-        """Test unsupported channel is rejected."""
-        with self.assertRaises(ValueError) as cm:
-            PackageSpec.parse("foo:dal=2025.9.0")
-        self.assertIn("Unsupported channel", str(cm.exception))
-
-
-if __name__ == "__main__":
-    unittest.main()
+@pytest.mark.parametrize("spec_str,channel,package,version", [
+    ("conda-forge:dal=2025.9.0", "conda-forge", "dal", "2025.9.0"),
+    ("intel:mkl=2025.1.0", "intel", "mkl", "2025.1.0"),
+    ("apt:intel-oneapi-dal=2025.9.0", "apt", "intel-oneapi-dal", "2025.9.0"),
+    # surrounding whitespace is stripped
+    ("  conda-forge : dal = 2025.9.0  ", "conda-forge", "dal", "2025.9.0"),
+])
+def test_parse_valid(spec_str, channel, package, version):
+    """Test channel:package=version parsing across channels."""
+    spec = PackageSpec.parse(spec_str)
+    assert (spec.channel, spec.package, spec.version) == (channel, package, version)
+    assert spec.path is None
+
+
+@pytest.mark.parametrize("spec_str,message", [
+    ("invalid-spec", "Invalid package spec"),          # missing colon
+    ("conda-forge:dal", "Invalid package spec"),       # missing version
+    ("conda-forge:=2025.9.0", "Empty package name"),
+    ("conda-forge:dal=", "Empty version"),
+    ("foo:dal=2025.9.0", "Unsupported channel"),
+])
+def test_parse_invalid(spec_str, message):
+    """Test malformed specs are rejected with a helpful message."""
+    with pytest.raises(ValueError, match=message):
+        PackageSpec.parse(spec_str)
+
+
+def test_string_representation():
+    """Test __str__ method."""
+    spec = PackageSpec.parse("conda-forge:dal=2025.9.0")
+    assert str(spec) == "conda-forge:dal=2025.9.0"
+
+
+def test_validate_spec_valid():
+    """Test validate_spec with valid input."""
+    assert validate_spec("conda-forge:dal=2025.9.0")
+
+
+def test_validate_spec_invalid():
+    """Test validate_spec with invalid input."""
+    assert not validate_spec("invalid")
+    assert not validate_spec("conda-forge:dal")
+
+
+def test_local_path():
+    """Test local:/path parsing."""
+    with tempfile.NamedTemporaryFile(suffix=".so") as tmp:
+        spec = PackageSpec.parse(f"local:{tmp.name}")
+        assert spec.channel == "local"
+        assert spec.path == Path(tmp.name).resolve()
+        assert spec.package == Path(tmp.name).stem
+        assert spec.version is None
+        assert str(spec) == f"local:{Path(tmp.name).resolve()}"
+
+
+def test_local_path_missing():
+    """Test local path validation when file does not exist."""
+    assert not validate_spec("local:/definitely/not/found/lib.so")
+
+
+def test_local_path_directory():
+    """Test local path must be a file, not a directory."""
+    with pytest.raises(ValueError, match="not a file"):
+        PackageSpec.parse("local:.")